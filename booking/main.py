@@ -4,34 +4,64 @@ Room booking with 8 time slots per day
 Port: 8001
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Header, Request
+from fastapi import FastAPI, HTTPException, Depends, Header, Request, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 import sqlite3
 from pydantic import BaseModel
-from datetime import datetime
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
+import hashlib
 import jwt
-import requests
+import orjson
+import httpx
+import aiosqlite
+import asyncio
+import atexit
 import logging
-import uuid
-
-# Configure logging
+import os
+import queue
+import secrets
+import time
+
+# Configure logging: request handlers only enqueue records, a listener
+# thread does the file and console writes
+log_handler = QueueHandler(queue.Queue(-1))
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - [%(correlation_id)s] - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('/tmp/booking.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[log_handler]
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Booking Service")
+def default_correlation_id(record):
+    """Give records from libraries (httpx, uvicorn) a placeholder ID for the format"""
+    record.correlation_id = getattr(record, 'correlation_id', '-')
+    return True
+
+log_handler.addFilter(default_correlation_id)
+
+log_listener = None
+
+def start_log_listener():
+    """Start the thread that drains the log queue (again in each forked worker)"""
+    global log_listener
+    log_handler.queue = queue.Queue(-1)
+    log_listener = QueueListener(log_handler.queue, logging.FileHandler('/tmp/booking.log'), logging.StreamHandler())
+    log_listener.start()
+
+start_log_listener()
+os.register_at_fork(after_in_child=start_log_listener)
+atexit.register(lambda: log_listener.stop())
+
+app = FastAPI(title="Booking Service", default_response_class=ORJSONResponse)
 
 # Add correlation ID middleware
 @app.middleware("http")
 async def add_correlation_id(request: Request, call_next):
-    correlation_id = str(uuid.uuid4())
+    correlation_id = request.headers.get('x-correlation-id') or secrets.token_hex(8)
     request.state.correlation_id = correlation_id
     logger.info(f"Request started: {request.method} {request.url.path}",
                 extra={'correlation_id': correlation_id})
@@ -40,6 +70,13 @@ async def add_correlation_id(request: Request, call_next):
                 extra={'correlation_id': correlation_id})
     return response
 
+@app.exception_handler(sqlite3.Error)
+async def database_error_handler(request: Request, exc: sqlite3.Error):
+    """Log database failures and answer with a generic 500"""
+    logger.exception("Database error: %s %s", request.method, request.url.path,
+                     exc_info=exc, extra={'correlation_id': getattr(request.state, 'correlation_id', 'N/A')})
+    return ORJSONResponse(status_code=500, content={"detail": "database error"})
+
 # JWT Configuration (must match gateway)
 SECRET_KEY = 'your-secret-key-change-in-production'
 ALGORITHM = 'HS256'
@@ -58,6 +95,8 @@ TIME_SLOTS = [
     "6:00 PM - 8:00 PM",
     "8:00 PM - 10:00 PM"
 ]
+TIME_SLOTS_SET = frozenset(TIME_SLOTS)
+INVALID_SLOT_DETAIL = f"Invalid time slot. Must be one of: {', '.join(TIME_SLOTS)}"
 
 # Configure CORS
 app.add_middleware(
@@ -66,18 +105,208 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # Let browsers cache preflights for a day
 )
 
 # Database setup
-def get_db():
-    conn = sqlite3.connect("bookings.db")
-    conn.row_factory = sqlite3.Row
-    return conn
+DB_PATH = "bookings.db"
+DB_READERS = int(os.getenv('BOOKING_DB_READERS', '4'))
+DB_STATEMENT_CACHE = 256
+
+# Per-connection tuning; journal_mode=WAL is persistent and set once in init_db()
+SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=1073741824",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+def configure_connection(conn: sqlite3.Connection):
+    """Apply the connection-level PRAGMAs"""
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+
+
+class ConnectionPool:
+    """Pool of long-lived aiosqlite connections
+
+    One read-write connection serializes all writes while N read-only
+    connections serve the listing endpoints. Each aiosqlite connection runs
+    its queries on its own thread, so handlers only await and never block
+    the event loop or the threadpool.
+    """
+
+    def __init__(self, db_path: str, readers: int = 4):
+        self.db_path = db_path
+        self.readers = readers
+        self._writer = None
+        self._readers = None
+
+    async def _connect(self, readonly: bool) -> aiosqlite.Connection:
+        """Open a connection in autocommit mode"""
+        if readonly:
+            conn = await aiosqlite.connect(f"file:{self.db_path}?mode=ro", uri=True, isolation_level=None,
+                                           cached_statements=DB_STATEMENT_CACHE)
+        else:
+            conn = await aiosqlite.connect(self.db_path, isolation_level=None,
+                                           cached_statements=DB_STATEMENT_CACHE)
+        conn.row_factory = sqlite3.Row
+        for pragma in SQLITE_PRAGMAS:
+            await conn.execute(pragma)
+        return conn
+
+    async def open(self):
+        """Fill the pool; called from the startup hook inside the event loop"""
+        self._writer = asyncio.Queue(maxsize=1)
+        self._readers = asyncio.Queue(maxsize=self.readers)
+        self._writer.put_nowait(await self._connect(readonly=False))
+        for _ in range(self.readers):
+            self._readers.put_nowait(await self._connect(readonly=True))
+
+    async def close(self):
+        """Drain the pool and close every idle connection"""
+        for pending in (self._writer, self._readers):
+            while pending is not None and not pending.empty():
+                await pending.get_nowait().close()
+
+    @asynccontextmanager
+    async def connection(self, readonly: bool = False):
+        """Borrow a connection and hand it back when done"""
+        pending = self._readers if readonly else self._writer
+        conn = await pending.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                await conn.rollback()
+            pending.put_nowait(conn)
+
+
+pool = ConnectionPool(DB_PATH, readers=DB_READERS)
+
+
+def get_db(readonly: bool = False):
+    """Get a pooled connection; pass readonly=True for queries that never write"""
+    return pool.connection(readonly)
+
+
+# Room names never change at runtime, so each worker caches them on first use
+room_names = {}
+
+async def get_room_name(conn: aiosqlite.Connection, room_id: int) -> Optional[str]:
+    """Look up a room name, hitting the database only the first time"""
+    name = room_names.get(room_id)
+    if name is None:
+        async with conn.execute(SQL_ROOM_NAME, (room_id,)) as cursor:
+            row = await cursor.fetchone()
+        if row:
+            name = room_names[room_id] = row['name']
+    return name
+
+
+# SQL statements are module constants so each pooled connection's
+# statement cache keeps hitting the same compiled statement
+SQL_LIST_ROOMS = "SELECT * FROM rooms"
+
+SQL_CHECK_AVAIL = """
+    SELECT r.name,
+           EXISTS(
+               SELECT 1 FROM bookings
+               WHERE room_id = r.id AND date = ? AND time_slot = ? AND status = 'active'
+           ) AS taken
+    FROM rooms r
+    WHERE r.id = ?
+"""
+
+# Inserts only if the room exists and the slot is free; rowcount 0 otherwise.
+# NOT EXISTS keeps conflicting attempts from consuming AUTOINCREMENT ids; if
+# another worker wins the race, ux_bookings_slot rejects the row and OR IGNORE
+# turns that into rowcount 0 instead of an IntegrityError
+SQL_INSERT_BOOKING = """
+    INSERT OR IGNORE INTO bookings (room_id, user_id, user_email, date, time_slot)
+    SELECT :room_id, :user_id, :user_email, :date, :time_slot
+    WHERE EXISTS (SELECT 1 FROM rooms WHERE id = :room_id)
+      AND NOT EXISTS (
+          SELECT 1 FROM bookings
+          WHERE room_id = :room_id AND date = :date AND time_slot = :time_slot AND status = 'active'
+      )
+"""
+
+SQL_ROOM_NAME = "SELECT name FROM rooms WHERE id = ?"
+
+SQL_BOOKINGS_VERSION = "SELECT version FROM bookings_version WHERE id = 1"
+
+SQL_LIST_USER_BOOKINGS = """
+    SELECT b.*, r.name as room_name
+    FROM bookings b
+    JOIN rooms r ON b.room_id = r.id
+    WHERE b.user_id = ? AND b.status = 'active'
+    ORDER BY b.date DESC, b.time_slot ASC
+"""
+
+SQL_LIST_ALL_BOOKINGS = """
+    SELECT b.*, r.name as room_name
+    FROM bookings b
+    JOIN rooms r ON b.room_id = r.id
+    WHERE b.status = 'active'
+    ORDER BY b.date DESC, b.time_slot ASC
+"""
+
+SQL_MY_BOOKINGS = """
+    SELECT b.*, r.name as room_name
+    FROM bookings b
+    JOIN rooms r ON b.room_id = r.id
+    WHERE b.user_id = ? AND b.status = 'active'
+    ORDER BY b.date ASC, b.time_slot ASC
+"""
+
+# Students see which slots are taken but not who booked them, so the owner
+# columns are masked for bookings that aren't theirs
+_OWNER_COLUMNS = {
+    True: """
+        CASE WHEN b.user_id = :me THEN b.user_id ELSE 'occupied' END AS user_id,
+        CASE WHEN b.user_id = :me THEN b.user_email ELSE 'Occupied' END AS user_email""",
+    False: "b.user_id, b.user_email",
+}
+
+# Keyed by (is_student, filter_by_room)
+SQL_BOOKINGS_BY_DATE = {
+    (student, by_room): f"""
+        SELECT b.id, b.room_id, {_OWNER_COLUMNS[student]}, b.date, b.time_slot, b.status, b.created_at,
+               r.name as room_name
+        FROM bookings b
+        JOIN rooms r ON b.room_id = r.id
+        WHERE b.date = :date {"AND b.room_id = :room_id" if by_room else ""} AND b.status = 'active'
+        ORDER BY b.time_slot ASC
+    """
+    for student in (True, False)
+    for by_room in (True, False)
+}
+
+SQL_GET_ACTIVE_BOOKING = """
+    SELECT b.user_id, b.room_id, b.date, b.time_slot, r.name as room_name
+    FROM bookings b
+    JOIN rooms r ON b.room_id = r.id
+    WHERE b.id = ? AND b.status = 'active'
+"""
+
+SQL_CANCEL_BOOKING = "UPDATE bookings SET status = 'cancelled' WHERE id = ?"
+
 
 def init_db():
-    conn = get_db()
+    # Dedicated connection so no pooled connection is opened before workers fork
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    configure_connection(conn)
     cur = conn.cursor()
 
+    # Schema and seed data go in a single write transaction
+    cur.execute("BEGIN IMMEDIATE")
+
     cur.execute("""
         CREATE TABLE IF NOT EXISTS rooms (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -86,7 +315,8 @@ def init_db():
         )
     """)
 
-    cur.execute("""
+    # created_at is stamped by SQLite so the insert path doesn't format it in Python
+    bookings_schema = """
         CREATE TABLE IF NOT EXISTS bookings (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             room_id INTEGER NOT NULL,
@@ -95,11 +325,53 @@ def init_db():
             date TEXT NOT NULL,
             time_slot TEXT NOT NULL,
             status TEXT DEFAULT 'active' CHECK(status IN ('active', 'cancelled')),
-            created_at TEXT NOT NULL,
-            FOREIGN KEY (room_id) REFERENCES rooms (id),
-            UNIQUE(room_id, date, time_slot, status)
+            created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+            FOREIGN KEY (room_id) REFERENCES rooms (id)
+        )
+    """
+
+    # Older databases lack the created_at default and still carry the
+    # UNIQUE(room_id, date, time_slot, status) constraint, which rejected a
+    # second cancellation of the same slot; rebuild the table to drop both
+    existing = cur.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'bookings'"
+    ).fetchone()
+    if existing and ("strftime" not in existing["sql"] or "UNIQUE" in existing["sql"]):
+        cur.execute("ALTER TABLE bookings RENAME TO bookings_old")
+        cur.execute(bookings_schema)
+        cur.execute("INSERT INTO bookings SELECT * FROM bookings_old")
+        cur.execute("DROP TABLE bookings_old")
+    else:
+        cur.execute(bookings_schema)
+
+    # At most one active booking per room and slot; cancelled rows don't count
+    cur.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_bookings_slot
+        ON bookings(room_id, date, time_slot) WHERE status = 'active'
+    """)
+
+    # Composite indexes for the listing and lookup queries
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_bookings_user_active ON bookings(user_id, status, date DESC)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_bookings_date_active ON bookings(date, status, time_slot)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_bookings_room_date ON bookings(room_id, date, status)")
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_bookings_date ON bookings(date DESC, time_slot) WHERE status = 'active'")
+
+    # Single-row change counter shared by every worker; the listings use it as
+    # their ETag, and triggers bump it on any write to bookings
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS bookings_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
         )
     """)
+    cur.execute("INSERT OR IGNORE INTO bookings_version (id, version) VALUES (1, 0)")
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS bookings_version_{event.lower()} AFTER {event} ON bookings
+            BEGIN
+                UPDATE bookings_version SET version = version + 1 WHERE id = 1;
+            END
+        """)
 
     # Insert sample rooms
     cur.execute("SELECT COUNT(*) AS c FROM rooms")
@@ -114,21 +386,48 @@ def init_db():
             ]
         )
 
-    conn.commit()
+    cur.execute("COMMIT")
+
+    # Refresh planner statistics so the indexes above get picked
+    cur.execute("ANALYZE")
     conn.close()
 
 init_db()
 
+# Shared HTTP client for outbound notification calls (created on startup)
+http_client: Optional[httpx.AsyncClient] = None
+
+@app.on_event("startup")
+async def open_db_pool():
+    await pool.open()
+
+@app.on_event("startup")
+async def open_http_client():
+    global http_client
+    http_client = httpx.AsyncClient(timeout=2.0)
+
+@app.on_event("shutdown")
+async def close_db_pool():
+    await pool.close()
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await http_client.aclose()
+
 # JWT Authentication
-def verify_token(authorization: Optional[str] = Header(None)):
+@lru_cache(maxsize=4096)
+def _decode(token: str) -> dict:
+    """Verify and decode a token; repeated tokens skip the HMAC and JSON parse"""
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+async def verify_token(authorization: Optional[str] = Header(None)):
     """Verify JWT token and extract user info"""
     if not authorization:
         raise HTTPException(status_code=401, detail="Authorization header missing")
     
     try:
         token = authorization.split(' ')[1]  # Bearer <token>
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        payload = _decode(token)
     except IndexError:
         raise HTTPException(status_code=401, detail="Invalid authorization format")
     except jwt.ExpiredSignatureError:
@@ -136,42 +435,39 @@ def verify_token(authorization: Optional[str] = Header(None)):
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-# Helper function to send notifications
-def send_notification(user_id: str, notification_type: str, message: str, token: str):
-    """Send notification to the notification service"""
+    # Cached payloads outlive the decode-time expiry check
+    exp = payload.get('exp')
+    if exp is not None and exp <= time.time():
+        raise HTTPException(status_code=401, detail="Token expired")
+    return dict(payload)
+
+# Helper functions to send notifications
+def user_notification(user_id: str, notification_type: str, message: str) -> dict:
+    """Batch item for a notification addressed to one user"""
+    return {'user_id': user_id, 'type': notification_type, 'message': message}
+
+def admin_notification(action_type: str, message: str, actor_name: str, actor_id: str) -> dict:
+    """Batch item fanned out to every admin by the notification service"""
+    return {
+        'audience': 'admins',
+        'type': action_type,
+        'message': message,
+        'actor_name': actor_name,
+        'actor_id': actor_id
+    }
+
+async def send_notifications(items: list, token: str):
+    """Send a batch of notifications in a single call to the notification service"""
     try:
-        requests.post(
-            f'{NOTIFICATION_SERVICE}/notifications',
+        await http_client.post(
+            f'{NOTIFICATION_SERVICE}/notifications/batch',
             headers={'Authorization': f'Bearer {token}'},
-            json={
-                'user_id': user_id,
-                'type': notification_type,
-                'message': message
-            },
+            json={'items': items},
             timeout=2
         )
     except Exception as e:
         # Don't fail the main operation if notification fails
-        logger.warning(f"Failed to send notification: {e}", extra={'correlation_id': 'notification'})
-
-def notify_admins(action_type: str, message: str, actor_name: str, actor_id: str, token: str):
-    """Send notification to all admin users - non-blocking"""
-    try:
-        # Use very short timeout and don't wait for response
-        requests.post(
-            f'{NOTIFICATION_SERVICE}/notifications/admin',
-            headers={'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'},
-            json={
-                'type': action_type,
-                'message': message,
-                'actor_name': actor_name,
-                'actor_id': actor_id
-            },
-            timeout=0.5
-        )
-    except Exception:
-        # Silently fail - notifications are not critical
-        pass
+        logger.warning(f"Failed to send notifications: {e}", extra={'correlation_id': 'notification'})
 
 # Request Models
 class BookingRequest(BaseModel):
@@ -180,257 +476,236 @@ class BookingRequest(BaseModel):
     time_slot: str
     purpose: Optional[str] = "Meeting"
 
+# Static payloads are serialized once at import time
+class StaticJSON:
+    """Pre-encoded JSON body with a content-derived ETag"""
+
+    def __init__(self, payload):
+        self.body = orjson.dumps(payload)
+        self.etag = f'"{hashlib.sha1(self.body).hexdigest()}"'
+
+    def respond(self, request: Request) -> Response:
+        """Serve the cached bytes, or 304 if the client already has them"""
+        if request.headers.get("if-none-match") == self.etag:
+            return Response(status_code=304, headers={"ETag": self.etag})
+        return Response(content=self.body, media_type="application/json", headers={"ETag": self.etag})
+
+HEALTH_RESPONSE = StaticJSON({
+    "status": "healthy",
+    "service": "booking",
+    "version": "2.0.0",
+    "time_slots": len(TIME_SLOTS)
+})
+
+HOME_RESPONSE = StaticJSON({
+    "service": "Booking Service",
+    "version": "2.0.0",
+    "features": ["JWT Auth", "RBAC", "8 Time Slots", "Room Booking"],
+    "time_slots": TIME_SLOTS
+})
+
+SLOTS_RESPONSE = StaticJSON({
+    "slots": [{"index": i, "time": slot} for i, slot in enumerate(TIME_SLOTS)]
+})
+
+# Booking listings are streamed in chunks rather than built as one list
+STREAM_CHUNK_ROWS = 256
+
+async def stream_bookings(request: Request, query: str, params, **fields) -> Response:
+    """Stream {**fields, "bookings": [...]} straight from the cursor
+
+    The response carries the bookings version as its ETag, and a matching
+    If-None-Match gets a 304 without running the query. The version is read
+    before the rows, so the ETag can only be older than the body, never newer.
+    The pooled read connection is held by the generator until the last row
+    has been sent.
+    """
+    async with get_db(readonly=True) as conn:
+        async with conn.execute(SQL_BOOKINGS_VERSION) as cursor:
+            version = (await cursor.fetchone())[0]
+    # Listings differ per user, so shared caches must key on the token too
+    headers = {"ETag": f'"bookings-{version}"', "Vary": "Authorization"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    head = orjson.dumps(fields)[:-1] + (b',"bookings":[' if fields else b'"bookings":[')
+
+    async def generate():
+        async with get_db(readonly=True) as conn:
+            async with conn.execute(query, params) as cursor:
+                # Plain tuples zipped against the column names read once per query,
+                # and one orjson call per chunk instead of one per row
+                cursor.row_factory = None
+                columns = [col[0] for col in cursor.description]
+                yield head
+                sep = b""
+                while True:
+                    rows = await cursor.fetchmany(STREAM_CHUNK_ROWS)
+                    if not rows:
+                        break
+                    yield sep + orjson.dumps([dict(zip(columns, row)) for row in rows])[1:-1]
+                    sep = b","
+        yield b"]}"
+
+    return StreamingResponse(generate(), media_type="application/json", headers=headers)
+
 # Endpoints
 @app.get("/health")
-def health_check():
-    return {
-        "status": "healthy",
-        "service": "booking",
-        "version": "2.0.0",
-        "time_slots": len(TIME_SLOTS)
-    }
+async def health_check(request: Request):
+    return HEALTH_RESPONSE.respond(request)
 
 @app.get("/")
-def home():
-    return {
-        "service": "Booking Service",
-        "version": "2.0.0",
-        "features": ["JWT Auth", "RBAC", "8 Time Slots", "Room Booking"],
-        "time_slots": TIME_SLOTS
-    }
+async def home(request: Request):
+    return HOME_RESPONSE.respond(request)
+
+# Rooms are only written by init_db(), so each worker encodes the list once
+rooms_response = None
 
 @app.get("/rooms")
-def list_rooms(user: dict = Depends(verify_token)):
+async def list_rooms(request: Request, user: dict = Depends(verify_token)):
     """List all available rooms"""
-    conn = get_db()
-    rooms = conn.execute("SELECT * FROM rooms").fetchall()
-    conn.close()
-    return {"rooms": [dict(room) for room in rooms]}
+    global rooms_response
+    if rooms_response is None:
+        async with get_db(readonly=True) as conn:
+            async with conn.execute(SQL_LIST_ROOMS) as cursor:
+                rooms = await cursor.fetchall()
+        rooms_response = StaticJSON({"rooms": [dict(room) for room in rooms]})
+    return rooms_response.respond(request)
 
 @app.get("/slots")
-def list_time_slots(user: dict = Depends(verify_token)):
+async def list_time_slots(request: Request, user: dict = Depends(verify_token)):
     """List all available time slots"""
-    return {
-        "slots": [{"index": i, "time": slot} for i, slot in enumerate(TIME_SLOTS)]
-    }
+    return SLOTS_RESPONSE.respond(request)
 
 @app.post("/bookings")
-def create_booking(booking: BookingRequest, user: dict = Depends(verify_token), authorization: str = Header(None)):
+async def create_booking(booking: BookingRequest, background_tasks: BackgroundTasks,
+                         user: dict = Depends(verify_token), authorization: str = Header(None)):
     """Create a new booking (all authenticated users)"""
     
     # Validate time slot
-    if booking.time_slot not in TIME_SLOTS:
-        raise HTTPException(status_code=400, detail=f"Invalid time slot. Must be one of: {TIME_SLOTS}")
+    if booking.time_slot not in TIME_SLOTS_SET:
+        raise HTTPException(status_code=400, detail=INVALID_SLOT_DETAIL)
     
-    conn = get_db()
-    cur = conn.cursor()
-
-    # Check if room exists
-    room = cur.execute("SELECT * FROM rooms WHERE id = ?", (booking.room_id,)).fetchone()
-    if not room:
-        conn.close()
-        raise HTTPException(status_code=404, detail="Room not found")
-
-    # Check for existing active booking
-    existing = cur.execute("""
-        SELECT * FROM bookings 
-        WHERE room_id = ? AND date = ? AND time_slot = ? AND status = 'active'
-    """, (booking.room_id, booking.date, booking.time_slot)).fetchone()
-
-    if existing:
-        conn.close()
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Room {room['name']} is already booked for {booking.time_slot} on {booking.date}"
-        )
+    async with get_db() as conn:
+        # Existence check, conflict check and insert in one statement
+        cursor = await conn.execute(SQL_INSERT_BOOKING, {
+            "room_id": booking.room_id,
+            "user_id": user['userId'],
+            "user_email": user['email'],
+            "date": booking.date,
+            "time_slot": booking.time_slot
+        })
+
+        if cursor.rowcount == 0:
+            # Nothing inserted: work out whether the room or the slot was the problem
+            async with conn.execute(SQL_CHECK_AVAIL, (booking.date, booking.time_slot, booking.room_id)) as check:
+                room = await check.fetchone()
+            if not room:
+                raise HTTPException(status_code=404, detail="Room not found")
+            raise HTTPException(
+                status_code=400,
+                detail=f"Room {room['name']} is already booked for {booking.time_slot} on {booking.date}"
+            )
 
-    # Create booking
-    cur.execute("""
-        INSERT INTO bookings (room_id, user_id, user_email, date, time_slot, created_at)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (
-        booking.room_id, 
-        user['userId'], 
-        user['email'],
-        booking.date, 
-        booking.time_slot, 
-        datetime.utcnow().isoformat()
-    ))
-
-    conn.commit()
-    booking_id = cur.lastrowid
-    conn.close()
+        booking_id = cursor.lastrowid
+        await cursor.close()
+        room_name = await get_room_name(conn, booking.room_id)
 
-    # Send notification
+    # Notify the user and the admins in one batch, after the response is sent
     token = authorization.split(' ')[1] if authorization else None
     if token:
-        send_notification(
-            user['userId'],
-            'booking_created',
-            f"Your booking for {room['name']} on {booking.date} at {booking.time_slot} was created successfully.",
-            token
-        )
-        
-        # Notify admins
-        notify_admins(
-            'booking_created',
-            f"{user.get('name', 'User')} created a booking for {room['name']} on {booking.date} at {booking.time_slot}",
-            user.get('name', 'Unknown'),
-            user['userId'],
-            token
-        )
+        background_tasks.add_task(send_notifications, [
+            user_notification(
+                user['userId'],
+                'booking_created',
+                f"Your booking for {room_name} on {booking.date} at {booking.time_slot} was created successfully."
+            ),
+            admin_notification(
+                'booking_created',
+                f"{user.get('name', 'User')} created a booking for {room_name} on {booking.date} at {booking.time_slot}",
+                user.get('name', 'Unknown'),
+                user['userId']
+            )
+        ], token)
 
     return {
         "message": "Booking created successfully",
         "booking_id": booking_id,
-        "room": room['name'],
+        "room": room_name,
         "date": booking.date,
         "time_slot": booking.time_slot
     }
 
 @app.get("/bookings")
-def list_bookings(user: dict = Depends(verify_token)):
+async def list_bookings(request: Request, user: dict = Depends(verify_token)):
     """
     List bookings based on user role:
     - Students: see only their own bookings with full details
     - Faculty/Admin: see all bookings with full details
     """
-    conn = get_db()
-    
     if user['role'] == 'student':
         # Students see only their own bookings
-        bookings = conn.execute("""
-            SELECT b.*, r.name as room_name
-            FROM bookings b
-            JOIN rooms r ON b.room_id = r.id
-            WHERE b.user_id = ? AND b.status = 'active'
-            ORDER BY b.date DESC, b.time_slot ASC
-        """, (user['userId'],)).fetchall()
-    else:
-        # Faculty and admin see all bookings
-        bookings = conn.execute("""
-            SELECT b.*, r.name as room_name
-            FROM bookings b
-            JOIN rooms r ON b.room_id = r.id
-            WHERE b.status = 'active'
-            ORDER BY b.date DESC, b.time_slot ASC
-        """).fetchall()
-    
-    conn.close()
-    return {"bookings": [dict(booking) for booking in bookings]}
+        return await stream_bookings(request, SQL_LIST_USER_BOOKINGS, (user['userId'],))
+
+    # Faculty and admin see all bookings
+    return await stream_bookings(request, SQL_LIST_ALL_BOOKINGS, ())
 
 @app.get("/bookings/{date}")
-def get_bookings_by_date(date: str, room_id: Optional[int] = None, user: dict = Depends(verify_token)):
+async def get_bookings_by_date(request: Request, date: str, room_id: Optional[int] = None,
+                               user: dict = Depends(verify_token)):
     """Get all bookings for a specific date, optionally filtered by room
     - Students: See which slots are taken but not who booked them
     - Faculty: See all booking details including who booked
     """
-    conn = get_db()
-    
-    if room_id:
-        bookings = conn.execute("""
-            SELECT b.*, r.name as room_name
-            FROM bookings b
-            JOIN rooms r ON b.room_id = r.id
-            WHERE b.date = ? AND b.room_id = ? AND b.status = 'active'
-            ORDER BY b.time_slot ASC
-        """, (date, room_id)).fetchall()
-    else:
-        bookings = conn.execute("""
-            SELECT b.*, r.name as room_name
-            FROM bookings b
-            JOIN rooms r ON b.room_id = r.id
-            WHERE b.date = ? AND b.status = 'active'
-            ORDER BY b.time_slot ASC
-        """, (date,)).fetchall()
-    
-    conn.close()
-    
-    # For students, hide user details
-    if user['role'] == 'student':
-        sanitized_bookings = []
-        for booking in bookings:
-            b_dict = dict(booking)
-            # Only show if it's their own booking or just mark as occupied
-            if b_dict['user_id'] != user['userId']:
-                # Hide user details for other people's bookings
-                b_dict['user_id'] = 'occupied'
-                b_dict['user_email'] = 'Occupied'
-            sanitized_bookings.append(b_dict)
-        return {"date": date, "bookings": sanitized_bookings}
-    
-    # Faculty see everything
-    return {"date": date, "bookings": [dict(booking) for booking in bookings]}
+    query = SQL_BOOKINGS_BY_DATE[(user['role'] == 'student', bool(room_id))]
+    return await stream_bookings(request, query, {"me": user['userId'], "date": date, "room_id": room_id}, date=date)
 
 @app.delete("/bookings/{booking_id}")
-def cancel_booking(booking_id: int, user: dict = Depends(verify_token), authorization: str = Header(None)):
+async def cancel_booking(booking_id: int, background_tasks: BackgroundTasks,
+                         user: dict = Depends(verify_token), authorization: str = Header(None)):
     """
     Cancel a booking:
     - Students: can only cancel their own bookings
     - Faculty/Admin: can cancel any booking
     """
-    conn = get_db()
-    cur = conn.cursor()
-
-    # Get booking with room info
-    booking = cur.execute("""
-        SELECT b.*, r.name as room_name
-        FROM bookings b
-        JOIN rooms r ON b.room_id = r.id
-        WHERE b.id = ? AND b.status = 'active'
-    """, (booking_id,)).fetchone()
-
-    if not booking:
-        conn.close()
-        raise HTTPException(status_code=404, detail="Booking not found or already cancelled")
-
-    # Check permissions
-    if user['role'] == 'student' and booking['user_id'] != user['userId']:
-        conn.close()
-        raise HTTPException(
-            status_code=403, 
-            detail="Students can only cancel their own bookings"
-        )
+    async with get_db() as conn:
+        # Get booking with room info
+        async with conn.execute(SQL_GET_ACTIVE_BOOKING, (booking_id,)) as cursor:
+            booking = await cursor.fetchone()
+
+        if not booking:
+            raise HTTPException(status_code=404, detail="Booking not found or already cancelled")
+
+        # Check permissions
+        if user['role'] == 'student' and booking['user_id'] != user['userId']:
+            raise HTTPException(
+                status_code=403,
+                detail="Students can only cancel their own bookings"
+            )
 
-    # Cancel booking (soft delete)
-    cur.execute("""
-        UPDATE bookings SET status = 'cancelled' WHERE id = ?
-    """, (booking_id,))
-    
-    conn.commit()
-    conn.close()
+        # Cancel booking (soft delete)
+        await conn.execute(SQL_CANCEL_BOOKING, (booking_id,))
 
-    # Send notification to the booking owner
+    # Notify the booking owner and the admins in one batch, after the response is sent
     token = authorization.split(' ')[1] if authorization else None
     if token:
-        send_notification(
-            booking['user_id'],
-            'booking_deleted',
-            f"Your booking for {booking['room_name']} on {booking['date']} at {booking['time_slot']} was deleted.",
-            token
-        )
-        
-        # Notify admins about the cancellation
         actor_name = user.get('name', 'Unknown')
         affected_user_id = booking['user_id']
-        
+
         # Determine who affected
         if user['userId'] == affected_user_id:
-            notify_admins(
-                'booking_deleted',
-                f"{actor_name} deleted their own booking for {booking['room_name']} on {booking['date']} at {booking['time_slot']}",
-                actor_name,
-                user['userId'],
-                token
-            )
+            admin_message = f"{actor_name} deleted their own booking for {booking['room_name']} on {booking['date']} at {booking['time_slot']}"
         else:
-            notify_admins(
+            admin_message = f"{actor_name} deleted a user's booking for {booking['room_name']} on {booking['date']} at {booking['time_slot']}"
+
+        background_tasks.add_task(send_notifications, [
+            user_notification(
+                booking['user_id'],
                 'booking_deleted',
-                f"{actor_name} deleted {booking['user_name'] if 'user_name' in booking.keys() else 'a user'}'s booking for {booking['room_name']} on {booking['date']} at {booking['time_slot']}",
-                actor_name,
-                user['userId'],
-                token
-            )
+                f"Your booking for {booking['room_name']} on {booking['date']} at {booking['time_slot']} was deleted."
+            ),
+            admin_notification('booking_deleted', admin_message, actor_name, user['userId'])
+        ], token)
 
     return {
         "message": "Booking cancelled successfully",
@@ -439,27 +714,12 @@ def cancel_booking(booking_id: int, user: dict = Depends(verify_token), authoriz
     }
 
 @app.get("/my-bookings")
-def get_my_bookings(user: dict = Depends(verify_token)):
+async def get_my_bookings(request: Request, user: dict = Depends(verify_token)):
     """Get current user's active bookings"""
-    conn = get_db()
-    bookings = conn.execute("""
-        SELECT b.*, r.name as room_name
-        FROM bookings b
-        JOIN rooms r ON b.room_id = r.id
-        WHERE b.user_id = ? AND b.status = 'active'
-        ORDER BY b.date ASC, b.time_slot ASC
-    """, (user['userId'],)).fetchall()
-    conn.close()
-    
-    return {
-        "user": user['email'],
-        "bookings": [dict(booking) for booking in bookings]
-    }
+    return await stream_bookings(request, SQL_MY_BOOKINGS, (user['userId'],), user=user['email'])
 
 if __name__ == "__main__":
     import uvicorn
     logger.info("📅 Booking Service starting on port 8001...", extra={'correlation_id': 'startup'})
-    logger.info("🕐 Available time slots:", extra={'correlation_id': 'startup'})
-    for i, slot in enumerate(TIME_SLOTS):
-        logger.info(f"   {i}: {slot}", extra={'correlation_id': 'startup'})
+    logger.info(f"🕐 {len(TIME_SLOTS)} time slots: {TIME_SLOTS[0]} … {TIME_SLOTS[-1]}", extra={'correlation_id': 'startup'})
     uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
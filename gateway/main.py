@@ -8,41 +8,93 @@ Role-Based Access:
 - Faculty/Student: Booking, GPA, Maintenance, Notifications
 """
 
-from flask import Flask, jsonify, request, Response, send_from_directory
+from flask import Flask, abort, g, jsonify, request, Response, send_from_directory
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException
 from werkzeug.security import generate_password_hash, check_password_hash
 import jwt
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from functools import wraps
+from enum import IntFlag
+from functools import lru_cache, wraps
+from logging.handlers import QueueHandler, QueueListener
+import atexit
 import uuid
+import secrets
+import hashlib
 import os
+import queue
+import re
+import threading
+import time
 import requests
 import logging
+from urllib3.util.retry import Retry
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - [%(correlation_id)s] - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('/tmp/gateway.log'),
-        logging.StreamHandler()
-    ]
-)
+try:
+    from orjson import loads as json_loads, dumps as _orjson_dumps
+    def json_dumps(obj):
+        return _orjson_dumps(obj).decode('utf-8')
+except ImportError:
+    from json import loads as json_loads, dumps as json_dumps
+
+class JSONLogFormatter(logging.Formatter):
+    """One JSON object per line; records from other libraries get cid '-'"""
+    def format(self, record):
+        return json_dumps({
+            'ts': record.created,
+            'lvl': record.levelname,
+            'logger': record.name,
+            'cid': getattr(record, 'correlation_id', '-'),
+            'msg': record.getMessage()
+        })
+
+# Configure logging: request handlers only enqueue records, a listener
+# thread formats them as JSON and does the file and console writes
+log_handler = QueueHandler(queue.Queue(-1))
+logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[log_handler])
 logger = logging.getLogger(__name__)
 
+log_listener = None
+
+def start_log_listener():
+    """Start the thread that drains the log queue (again in each forked worker)"""
+    global log_listener
+    log_handler.queue = queue.Queue(-1)
+    handlers = [logging.FileHandler('/tmp/gateway.log'), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(JSONLogFormatter())
+    log_listener = QueueListener(log_handler.queue, *handlers)
+    log_listener.start()
+
+start_log_listener()
+os.register_at_fork(after_in_child=start_log_listener)
+atexit.register(lambda: log_listener.stop())
+
 app = Flask(__name__, static_folder='static', static_url_path='')
-CORS(app)
+CORS(app, send_wildcard=True, max_age=86400)
+
+CORRELATION_ID_RE = re.compile(r'[0-9a-fA-F-]{8,64}')
 
 # Add correlation ID to all requests
 @app.before_request
 def before_request():
-    request.correlation_id = str(uuid.uuid4())
+    # Frontend pages (serve_page) skip the correlation ID and request logging
+    if request.endpoint == 'serve_page':
+        return
+    # Clients may pass their own ID, but it goes into every log line and
+    # backend call, so only a short hex/UUID-style one is kept
+    inbound_id = request.headers.get('X-Correlation-Id', '')
+    request.correlation_id = inbound_id if CORRELATION_ID_RE.fullmatch(inbound_id) else secrets.token_hex(8)
     logger.info(f"Request started: {request.method} {request.path}", 
                 extra={'correlation_id': request.correlation_id})
 
 @app.after_request
 def after_request(response):
+    if request.endpoint == 'serve_page':
+        return response
     logger.info(f"Request completed: {request.method} {request.path} - Status: {response.status_code}",
                 extra={'correlation_id': getattr(request, 'correlation_id', 'N/A')})
     return response
@@ -52,6 +104,19 @@ SECRET_KEY = os.getenv('JWT_SECRET', 'your-secret-key-change-in-production')
 ALGORITHM = 'HS256'
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
 
+class Role(IntFlag):
+    """User roles as bits, so a permission check is a single AND"""
+    ADMIN = 1
+    FACULTY = 2
+    STUDENT = 4
+
+ROLE_BITS = {'admin': Role.ADMIN, 'faculty': Role.FACULTY, 'student': Role.STUDENT}
+
+# Signature checks go through one low-level JWS instance with the key
+# encoded once, instead of jwt.decode() rebuilding both on every call
+jws = jwt.PyJWS(algorithms=[ALGORITHM])
+SIGNING_KEY = SECRET_KEY.encode('utf-8')
+
 # Service URLs - All services running and configured
 SERVICES = {
     'users': 'http://localhost:8002',
@@ -61,16 +126,95 @@ SERVICES = {
     'maintenance': 'http://localhost:8080'
 }
 
+# Backend calls share one keep-alive session so each proxied request
+# reuses a pooled connection instead of opening a new TCP connection.
+# Under gevent workers hundreds of requests are in flight per process, so
+# each backend host keeps up to 50 idle connections; bursts beyond that
+# open extra connections rather than queueing behind the pool
+HTTP_POOL_SIZE = int(os.getenv('GATEWAY_HTTP_POOL_SIZE', '50'))
+HTTP_TIMEOUT = (1, 10)  # (connect, read) seconds
+
+# Failed connects and 502/503/504 from idempotent requests are retried with
+# a short backoff; after the last attempt the backend's own response is relayed
+HTTP_RETRY = Retry(total=3, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False)
+
+http = requests.Session()
+http_adapter = requests.adapters.HTTPAdapter(pool_connections=len(SERVICES), pool_maxsize=HTTP_POOL_SIZE,
+                                             max_retries=HTTP_RETRY)
+http.mount('http://', http_adapter)
+http.mount('https://', http_adapter)
+
+# Per-backend circuit breakers: after a failed connect or a timeout the
+# backend is skipped for 2, 4, 8 ... up to 30 seconds, answering 503 at once
+BREAKER_MAX_OPEN = 30
+breakers = {url: {'open_until': 0.0, 'fails': 0} for url in SERVICES.values()}
+
+def breaker_open(service_url):
+    """True while requests to this backend should fail fast"""
+    breaker = breakers.get(service_url)
+    return breaker is not None and time.monotonic() < breaker['open_until']
+
+def record_failure(service_url):
+    breaker = breakers.get(service_url)
+    if breaker is not None:
+        breaker['fails'] += 1
+        breaker['open_until'] = time.monotonic() + min(BREAKER_MAX_OPEN, 2 ** breaker['fails'])
+
+def record_success(service_url):
+    breaker = breakers.get(service_url)
+    if breaker is not None and breaker['fails']:
+        breaker['fails'] = 0
+        breaker['open_until'] = 0.0
+
 # Database setup
-def get_db():
-    conn = sqlite3.connect('gateway.db')
+DB_PATH = 'gateway.db'
+DB_POOL_SIZE = int(os.getenv('GATEWAY_DB_POOL_SIZE', '8'))
+
+# Applied once when each pooled connection is opened
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=5000",
+)
+
+def connect_db():
+    """Open a long-lived, tuned connection in autocommit mode"""
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
     conn.row_factory = sqlite3.Row
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
+# Connections are opened once and shared by all request threads
+db_pool = queue.Queue(maxsize=DB_POOL_SIZE)
+for _ in range(DB_POOL_SIZE):
+    db_pool.put(connect_db())
+
+@contextmanager
+def get_db():
+    """Borrow a pooled connection and hand it back when done"""
+    conn = db_pool.get()
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        db_pool.put(conn)
+
 def init_db():
-    conn = get_db()
+    with get_db() as conn:
+        init_schema(conn)
+
+def init_schema(conn):
     cur = conn.cursor()
     
+    # Schema and default users are written in one transaction (a single fsync)
+    cur.execute("BEGIN IMMEDIATE")
+    
     cur.execute("""
         CREATE TABLE IF NOT EXISTS users (
             id TEXT PRIMARY KEY,
@@ -85,24 +229,86 @@ def init_db():
     # Insert default users
     cur.execute("SELECT COUNT(*) as c FROM users")
     if cur.fetchone()['c'] == 0:
+        created_at = datetime.utcnow().isoformat()
         default_users = [
-            ('admin-001', 'admin@example.com', 'Admin User', 'admin123', 'admin'),
-            ('faculty-001', 'faculty@example.com', 'Faculty User', 'faculty123', 'faculty'),
-            ('student-001', 'student@example.com', 'Student User', 'student123', 'student'),
+            ('admin-001', 'admin@example.com', 'Admin User', generate_password_hash('admin123'), 'admin', created_at),
+            ('faculty-001', 'faculty@example.com', 'Faculty User', generate_password_hash('faculty123'), 'faculty', created_at),
+            ('student-001', 'student@example.com', 'Student User', generate_password_hash('student123'), 'student', created_at),
         ]
         
-        for user_id, email, name, password, role in default_users:
-            cur.execute("""
-                INSERT INTO users (id, email, name, password, role, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (user_id, email, name, password, role, datetime.utcnow().isoformat()))
+        cur.executemany("""
+            INSERT INTO users (id, email, name, password, role, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, default_users)
     
-    conn.commit()
-    conn.close()
+    # Hash any passwords still stored in plain text by older versions
+    plaintext = cur.execute(
+        "SELECT id, password FROM users WHERE password NOT LIKE 'pbkdf2:%' AND password NOT LIKE 'scrypt:%'"
+    ).fetchall()
+    cur.executemany(
+        "UPDATE users SET password = ? WHERE id = ?",
+        [(generate_password_hash(row['password']), row['id']) for row in plaintext]
+    )
+    
+    cur.execute("COMMIT")
 
 init_db()
 
+# User lookups on the auth path
+PUBLIC_USER_FIELDS = ('id', 'email', 'name', 'role', 'created_at')
+
+class UserDirectory:
+    """In-memory copy of the users table, indexed by id and by email
+
+    Before each lookup a dedicated connection checks PRAGMA data_version,
+    which only changes when another connection (any pooled connection or
+    another worker process) has committed; the table is reloaded then.
+    """
+    
+    def __init__(self):
+        self._conn = connect_db()
+        self._lock = threading.Lock()
+        self._version = None
+        self._by_id = {}
+        self._by_email = {}
+    
+    def _sync(self):
+        """Reload the users if gateway.db changed since the last lookup"""
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._version:
+                users = [dict(row) for row in self._conn.execute("SELECT * FROM users")]
+                self._by_id = {user['id']: user for user in users}
+                self._by_email = {user['email']: user for user in users}
+                self._version = version
+            return self._by_id, self._by_email
+    
+    def by_id(self, user_id):
+        return self._sync()[0].get(user_id)
+    
+    def by_email(self, email):
+        return self._sync()[1].get(email)
+
+users_directory = UserDirectory()
+
 # JWT Helper Functions
+# Successful logins per (stored hash, password digest); a password change
+# yields a new hash, and failed attempts always pay for the full hash check
+VERIFIED_LOGINS_MAX = 1024
+verified_logins = set()
+
+def verify_password(password_hash, password):
+    """Verify a password against its stored hash, skipping the slow hash on repeat logins"""
+    key = (password_hash, hashlib.blake2b(password.encode('utf-8'), digest_size=16).digest())
+    if key in verified_logins:
+        return True
+    if not check_password_hash(password_hash, password):
+        return False
+    if len(verified_logins) >= VERIFIED_LOGINS_MAX:
+        verified_logins.clear()
+    verified_logins.add(key)
+    return True
+
 def create_access_token(user_data):
     """Create JWT access token"""
     payload = {
@@ -118,69 +324,158 @@ def create_access_token(user_data):
         token = token.decode('utf-8')
     return token
 
+@lru_cache(maxsize=4096)
+def _decode_token(token):
+    """Check the signature and parse the payload; repeated tokens skip the HMAC and JSON parse"""
+    try:
+        payload = json_loads(jws.decode(token, SIGNING_KEY, algorithms=[ALGORITHM]))
+    except (jwt.InvalidTokenError, ValueError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    payload['role_bits'] = int(ROLE_BITS.get(payload.get('role'), 0))
+    return payload
+
 def verify_token(token):
     """Verify and decode JWT token"""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except jwt.ExpiredSignatureError:
+    payload = _decode_token(token)
+    
+    # Expiry is checked on every call since cached payloads outlive it
+    now = time.time()
+    if payload is None or not isinstance(payload.get('exp'), (int, float)) or payload['exp'] <= now:
         return None
-    except jwt.InvalidTokenError:
+    if isinstance(payload.get('nbf'), (int, float)) and payload['nbf'] > now:
         return None
+    return dict(payload)
 
 # Authentication Middleware
+@app.before_request
+def load_user():
+    """Resolve the bearer token once per request into g.user (or g.auth_error)"""
+    g.user = None
+    g.auth_error = 'Token is missing'
+    if request.endpoint == 'serve_page':
+        return
+    
+    # Get token from Authorization header
+    auth_header = request.headers.get('Authorization')
+    if not auth_header:
+        return
+    try:
+        token = auth_header.split(' ')[1]  # Bearer <token>
+    except IndexError:
+        g.auth_error = 'Invalid token format'
+        return
+    if not token:
+        return
+    
+    g.user = verify_token(token)
+    if g.user is None:
+        g.auth_error = 'Invalid or expired token'
+
 def token_required(f):
     """Decorator to require valid JWT token"""
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-        
-        # Get token from Authorization header
-        auth_header = request.headers.get('Authorization')
-        if auth_header:
-            try:
-                token = auth_header.split(' ')[1]  # Bearer <token>
-            except IndexError:
-                return jsonify({'error': 'Invalid token format'}), 401
-        
-        if not token:
-            return jsonify({'error': 'Token is missing'}), 401
-        
-        # Verify token
-        payload = verify_token(token)
-        if not payload:
-            return jsonify({'error': 'Invalid or expired token'}), 401
-        
-        # Add user info to request
-        request.user = payload
+        if g.user is None:
+            return jsonify({'error': g.auth_error}), 401
         return f(*args, **kwargs)
     
     return decorated
 
-def role_required(*allowed_roles):
-    """Decorator to require specific role(s)"""
+def role_required(allowed_roles):
+    """Decorator to require one of the roles in a Role bitset"""
+    required = int(allowed_roles)
+    
     def decorator(f):
         @wraps(f)
         def decorated(*args, **kwargs):
-            if not hasattr(request, 'user'):
+            if g.user is None:
                 return jsonify({'error': 'Authentication required'}), 401
             
-            if request.user['role'] not in allowed_roles:
+            if not g.user['role_bits'] & required:
                 return jsonify({'error': 'Insufficient permissions'}), 403
             
             return f(*args, **kwargs)
         return decorated
     return decorator
 
-# Health Check
+# Health Check: the body only changes with its timestamp, so it's
+# serialized at most once a second
+health_body = (0, b'')
+
 @app.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({
-        'status': 'healthy',
+    global health_body
+    second, body = health_body
+    now = int(time.time())
+    if now != second:
+        body = json_dumps({
+            'status': 'healthy',
+            'service': 'gateway',
+            'version': '2.0.0',
+            'timestamp': datetime.utcnow().isoformat()
+        })
+        health_body = (now, body)
+    return Response(body, status=200, mimetype='application/json')
+
+# Backend health is probed concurrently, without retries, so the check takes
+# as long as the slowest backend rather than the sum of all of them
+HEALTH_TIMEOUT = 2
+health_http = requests.Session()
+health_pool = ThreadPoolExecutor(max_workers=len(SERVICES), thread_name_prefix='health')
+HEALTH_URLS = {name: f"{url}/health" for name, url in SERVICES.items()}
+
+def probe_service(url, health_url):
+    """Fetch one backend's /health and summarize it"""
+    try:
+        response = health_http.get(health_url, timeout=HEALTH_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        # An unreachable backend also opens its breaker for the proxy routes
+        record_failure(url)
+        return {'status': 'unreachable', 'error': type(e).__name__}
+    record_success(url)
+    return {'status': 'healthy' if response.ok else 'unhealthy', 'code': response.status_code}
+
+# Frequent pollers share one fan-out per TTL; ?fresh=1 bypasses the cache
+HEALTH_CACHE_TTL = 1.0
+health_cache = {'ts': float('-inf'), 'result': None}
+health_lock = threading.Lock()
+
+def health_cache_fresh():
+    return time.monotonic() - health_cache['ts'] < HEALTH_CACHE_TTL
+
+@app.route('/health/services', methods=['GET'])
+def services_health():
+    """Gateway health plus every backend's, checked in parallel and cached briefly"""
+    use_cache = request.args.get('fresh') != '1'
+    if not (use_cache and health_cache_fresh()):
+        with health_lock:
+            # Whoever waited on the lock reuses the fan-out that just finished
+            if not (use_cache and health_cache_fresh()):
+                health_cache['result'] = check_services()
+                health_cache['ts'] = time.monotonic()
+    
+    body, status = health_cache['result']
+    return jsonify(body), status
+
+def check_services():
+    """Probe every backend and build the (body, status) health result"""
+    futures = {name: health_pool.submit(probe_service, url, HEALTH_URLS[name]) for name, url in SERVICES.items()}
+    wait(futures.values(), timeout=HEALTH_TIMEOUT + 1)
+    
+    services = {
+        name: future.result() if future.done() else {'status': 'unreachable', 'error': 'Timeout'}
+        for name, future in futures.items()
+    }
+    all_healthy = all(service['status'] == 'healthy' for service in services.values())
+    
+    return {
+        'status': 'healthy' if all_healthy else 'degraded',
         'service': 'gateway',
-        'version': '2.0.0',
+        'services': services,
         'timestamp': datetime.utcnow().isoformat()
-    }), 200
+    }, 200 if all_healthy else 503
 
 # Authentication Endpoints
 @app.route('/auth/login', methods=['POST'])
@@ -196,21 +491,12 @@ def login():
         password = data['password']
         
         # Find user
-        conn = get_db()
-        user = conn.execute('SELECT * FROM users WHERE email = ?', (email,)).fetchone()
-        conn.close()
+        user = users_directory.by_email(email)
         
         if not user:
             return jsonify({'error': 'Invalid credentials'}), 401
         
-        # Check password - handle both plain text (default users) and hashed passwords
-        password_valid = False
-        if user['password'].startswith('pbkdf2:sha256:') or user['password'].startswith('scrypt:'):
-            # Hashed password
-            password_valid = check_password_hash(user['password'], password)
-        else:
-            # Plain text password (for default users)
-            password_valid = (user['password'] == password)
+        password_valid = verify_password(user['password'], password)
         
         if not password_valid:
             return jsonify({'error': 'Invalid credentials'}), 401
@@ -244,9 +530,9 @@ def get_current_user():
     """Get current user info from token"""
     return jsonify({
         'user': {
-            'id': request.user['userId'],
-            'email': request.user['email'],
-            'role': request.user['role']
+            'id': g.user['userId'],
+            'email': g.user['email'],
+            'role': g.user['role']
         }
     }), 200
 
@@ -264,24 +550,21 @@ def register():
         if data['role'] not in ['admin', 'faculty', 'student']:
             return jsonify({'error': 'Invalid role'}), 400
         
-        conn = get_db()
-        
         # Check if user exists
-        existing = conn.execute('SELECT id FROM users WHERE email = ?', (data['email'],)).fetchone()
-        if existing:
-            conn.close()
+        if users_directory.by_email(data['email']):
             return jsonify({'error': 'Email already registered'}), 409
         
-        # Create user
-        user_id = str(uuid.uuid4())
-        conn.execute("""
-            INSERT INTO users (id, email, name, password, role, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (user_id, data['email'], data['name'], data['password'], 
-              data['role'], datetime.utcnow().isoformat()))
+        # Hash outside the pooled connection; it is deliberately slow
+        hashed_password = generate_password_hash(data['password'])
         
-        conn.commit()
-        conn.close()
+        with get_db() as conn:
+            # Create user
+            user_id = str(uuid.uuid4())
+            conn.execute("""
+                INSERT INTO users (id, email, name, password, role, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (user_id, data['email'], data['name'], hashed_password, 
+                  data['role'], datetime.utcnow().isoformat()))
         
         return jsonify({
             'message': 'User registered successfully',
@@ -292,18 +575,39 @@ def register():
         return jsonify({'error': str(e)}), 500
 
 # User Management Endpoints
+
+# Admin notifications are posted from a small pool so user-management
+# responses don't wait on the notification service
+notification_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='notify')
+
+def post_admin_notification(payload, headers):
+    try:
+        http.post(f"{SERVICES['notifications']}/notifications/admin", json=payload, headers=headers, timeout=0.5)
+    except Exception:
+        pass  # Non-blocking notification
+
+def notify_admins(notification_type, message):
+    """Queue a notification to all admins about the current user's action"""
+    actor = g.user
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    notification_pool.submit(post_admin_notification, {
+        'type': notification_type,
+        'message': message,
+        'actor_name': actor.get('name', 'Unknown'),
+        'actor_id': actor.get('userId', 'unknown')
+    }, {'Authorization': f'Bearer {token}', 'X-Correlation-Id': request.correlation_id})
+
 @app.route('/users', methods=['GET'])
 @token_required
-@role_required('admin')
+@role_required(Role.ADMIN)
 def get_users():
     """Get all users (admin only)"""
-    conn = get_db()
-    users = conn.execute("""
-        SELECT id, email, name, role, created_at 
-        FROM users 
-        ORDER BY created_at DESC
-    """).fetchall()
-    conn.close()
+    with get_db() as conn:
+        users = conn.execute("""
+            SELECT id, email, name, role, created_at 
+            FROM users 
+            ORDER BY created_at DESC
+        """).fetchall()
     
     return jsonify({
         'users': [dict(user) for user in users]
@@ -314,59 +618,32 @@ def get_users():
 def get_user(user_id):
     """Get user by ID (own profile or admin)"""
     # Users can only view their own profile unless they're admin
-    if request.user['userId'] != user_id and request.user['role'] != 'admin':
+    if g.user['userId'] != user_id and g.user['role'] != 'admin':
         return jsonify({'error': 'Unauthorized'}), 403
     
-    conn = get_db()
-    user = conn.execute("""
-        SELECT id, email, name, role, created_at 
-        FROM users 
-        WHERE id = ?
-    """, (user_id,)).fetchone()
-    conn.close()
+    user = users_directory.by_id(user_id)
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
     
-    return jsonify({'user': dict(user)}), 200
+    return jsonify({'user': {field: user[field] for field in PUBLIC_USER_FIELDS}}), 200
 
 @app.route('/users/<user_id>', methods=['DELETE'])
 @token_required
-@role_required('admin')
+@role_required(Role.ADMIN)
 def delete_user(user_id):
     """Delete user (admin only)"""
-    conn = get_db()
-    
-    # Get user info before deleting for notification
-    user = conn.execute('SELECT email, name FROM users WHERE id = ?', (user_id,)).fetchone()
-    
-    if not user:
-        conn.close()
-        return jsonify({'error': 'User not found'}), 404
+    with get_db() as conn:
+        # Get user info before deleting for notification
+        user = conn.execute('SELECT email, name FROM users WHERE id = ?', (user_id,)).fetchone()
+        
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        conn.execute('DELETE FROM users WHERE id = ?', (user_id,))
     
-    result = conn.execute('DELETE FROM users WHERE id = ?', (user_id,))
-    conn.commit()
-    conn.close()
-    
-    # Send notification to admins
-    try:
-        actor = request.user
-        token = request.headers.get('Authorization', '').replace('Bearer ', '')
-        
-        # Notify admins about user deletion
-        requests.post(
-            f"{SERVICES['notifications']}/notifications/admin",
-            json={
-                'type': 'user_deleted',
-                'message': f"User {user['name']} ({user['email']}) was deleted",
-                'actor_name': actor.get('name', 'Unknown'),
-                'actor_id': actor.get('userId', 'unknown')
-            },
-            headers={'Authorization': f'Bearer {token}'},
-            timeout=0.5
-        )
-    except:
-        pass  # Non-blocking notification
+    # Notify admins about user deletion
+    notify_admins('user_deleted', f"User {user['name']} ({user['email']}) was deleted")
     
     return jsonify({
         'message': 'User deleted successfully',
@@ -375,7 +652,7 @@ def delete_user(user_id):
 
 @app.route('/users', methods=['POST'])
 @token_required
-@role_required('admin')
+@role_required(Role.ADMIN)
 def create_user():
     """Create new user (admin only)"""
     data = request.get_json()
@@ -386,44 +663,22 @@ def create_user():
     if data['role'] not in ['student', 'faculty', 'admin']:
         return jsonify({'error': 'Invalid role. Must be: student, faculty, or admin'}), 400
     
-    conn = get_db()
-    
     # Check if user already exists
-    existing = conn.execute('SELECT id FROM users WHERE email = ?', (data['email'],)).fetchone()
-    if existing:
-        conn.close()
+    if users_directory.by_email(data['email']):
         return jsonify({'error': 'User with this email already exists'}), 409
     
     try:
         hashed_password = generate_password_hash(data['password'])
         user_id = str(uuid.uuid4())
         
-        conn.execute("""
-            INSERT INTO users (id, email, name, password, role, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (user_id, data['email'], data['name'], hashed_password, data['role'], datetime.utcnow()))
-        
-        conn.commit()
-        conn.close()
+        with get_db() as conn:
+            conn.execute("""
+                INSERT INTO users (id, email, name, password, role, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (user_id, data['email'], data['name'], hashed_password, data['role'], datetime.utcnow()))
         
         # Send notification to admins
-        try:
-            actor = request.user
-            token = request.headers.get('Authorization', '').replace('Bearer ', '')
-            
-            requests.post(
-                f"{SERVICES['notifications']}/notifications/admin",
-                json={
-                    'type': 'user_created',
-                    'message': f"New user {data['name']} ({data['email']}) with role {data['role']} was created",
-                    'actor_name': actor.get('name', 'Unknown'),
-                    'actor_id': actor.get('userId', 'unknown')
-                },
-                headers={'Authorization': f'Bearer {token}'},
-                timeout=0.5
-            )
-        except:
-            pass  # Non-blocking notification
+        notify_admins('user_created', f"New user {data['name']} ({data['email']}) with role {data['role']} was created")
         
         return jsonify({
             'message': 'User created successfully',
@@ -432,12 +687,11 @@ def create_user():
         }), 201
         
     except Exception as e:
-        conn.close()
         return jsonify({'error': str(e)}), 500
 
 @app.route('/users/<user_id>', methods=['PUT'])
 @token_required
-@role_required('admin')
+@role_required(Role.ADMIN)
 def update_user(user_id):
     """Update user (admin only)"""
     data = request.get_json()
@@ -445,27 +699,24 @@ def update_user(user_id):
     if not data:
         return jsonify({'error': 'No data provided'}), 400
     
-    conn = get_db()
-    
-    # Check if user exists
-    user = conn.execute('SELECT id FROM users WHERE id = ?', (user_id,)).fetchone()
-    if not user:
-        conn.close()
-        return jsonify({'error': 'User not found'}), 404
-    
-    # Build update query dynamically
-    update_fields = []
-    update_values = []
-    
-    if 'email' in data:
-        # Check if email is already taken by another user
-        existing = conn.execute('SELECT id FROM users WHERE email = ? AND id != ?', 
-                               (data['email'], user_id)).fetchone()
-        if existing:
-            conn.close()
-            return jsonify({'error': 'Email already taken by another user'}), 409
-        update_fields.append('email = ?')
-        update_values.append(data['email'])
+    with get_db() as conn:
+        # Check if user exists
+        user = conn.execute('SELECT id FROM users WHERE id = ?', (user_id,)).fetchone()
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        # Build update query dynamically
+        update_fields = []
+        update_values = []
+        
+        if 'email' in data:
+            # Check if email is already taken by another user
+            existing = conn.execute('SELECT id FROM users WHERE email = ? AND id != ?', 
+                                   (data['email'], user_id)).fetchone()
+            if existing:
+                return jsonify({'error': 'Email already taken by another user'}), 409
+            update_fields.append('email = ?')
+            update_values.append(data['email'])
     
     if 'name' in data:
         update_fields.append('name = ?')
@@ -473,7 +724,6 @@ def update_user(user_id):
     
     if 'role' in data:
         if data['role'] not in ['student', 'faculty', 'admin']:
-            conn.close()
             return jsonify({'error': 'Invalid role. Must be: student, faculty, or admin'}), 400
         update_fields.append('role = ?')
         update_values.append(data['role'])
@@ -484,25 +734,20 @@ def update_user(user_id):
         update_values.append(hashed_password)
     
     if not update_fields:
-        conn.close()
         return jsonify({'error': 'No valid fields to update'}), 400
     
     try:
-        # Get user info for notification
-        user_info = conn.execute('SELECT name, email FROM users WHERE id = ?', (user_id,)).fetchone()
-        
-        update_values.append(user_id)  # Add user_id for WHERE clause
-        query = f"UPDATE users SET {', '.join(update_fields)} WHERE id = ?"
-        
-        conn.execute(query, update_values)
-        conn.commit()
-        conn.close()
+        with get_db() as conn:
+            # Get user info for notification
+            user_info = conn.execute('SELECT name, email FROM users WHERE id = ?', (user_id,)).fetchone()
+            
+            update_values.append(user_id)  # Add user_id for WHERE clause
+            query = f"UPDATE users SET {', '.join(update_fields)} WHERE id = ?"
+            
+            conn.execute(query, update_values)
         
         # Send notification to admins
         try:
-            actor = request.user
-            token = request.headers.get('Authorization', '').replace('Bearer ', '')
-            
             # Build change description
             changes = []
             if 'email' in data:
@@ -516,17 +761,7 @@ def update_user(user_id):
             
             change_text = ', '.join(changes)
             
-            requests.post(
-                f"{SERVICES['notifications']}/notifications/admin",
-                json={
-                    'type': 'user_updated',
-                    'message': f"User {user_info['name']} ({user_info['email']}) was updated: {change_text}",
-                    'actor_name': actor.get('name', 'Unknown'),
-                    'actor_id': actor.get('userId', 'unknown')
-                },
-                headers={'Authorization': f'Bearer {token}'},
-                timeout=0.5
-            )
+            notify_admins('user_updated', f"User {user_info['name']} ({user_info['email']}) was updated: {change_text}")
         except:
             pass  # Non-blocking notification
         
@@ -536,7 +771,6 @@ def update_user(user_id):
         }), 200
         
     except Exception as e:
-        conn.close()
         return jsonify({'error': str(e)}), 500
 
 # Service Info
@@ -546,38 +780,60 @@ def home():
     return send_from_directory('static', 'login.html')
 
 # Proxy helper function
-def proxy_request(service_url, path, method='GET', data=None):
-    """Forward request to backend service"""
+PROXY_CHUNK_SIZE = 64 * 1024
+
+# Headers that describe a single connection (or are recomputed per hop) and
+# must not be copied between the client and backend requests
+HOP_BY_HOP = frozenset({
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization', 'te',
+    'trailers', 'transfer-encoding', 'upgrade', 'host', 'content-length'
+})
+# Set by the gateway itself on the way out
+GATEWAY_HEADERS = frozenset({'date', 'server'})
+
+def proxy_request(service_url, url, method='GET', body=None):
+    """Forward request to backend service (url is the full backend URL)"""
     try:
-        url = f"{service_url}{path}"
-        headers = {}
-        
-        # Forward authorization header
-        if 'Authorization' in request.headers:
-            headers['Authorization'] = request.headers['Authorization']
-        
-        # Forward request
-        if method == 'GET':
-            response = requests.get(url, headers=headers, timeout=10)
-        elif method == 'POST':
-            response = requests.post(url, json=data, headers=headers, timeout=10)
-        elif method == 'PUT':
-            response = requests.put(url, json=data, headers=headers, timeout=10)
-        elif method == 'DELETE':
-            response = requests.delete(url, headers=headers, timeout=10)
-        else:
+        # Forward the client's headers (Authorization, Content-Type, If-None-Match, ...)
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in HOP_BY_HOP}
+        headers['X-Correlation-Id'] = request.correlation_id
+        
+        if method not in ('GET', 'POST', 'PUT', 'DELETE'):
             return jsonify({'error': 'Method not allowed'}), 405
         
-        # Return response
-        return Response(
-            response.content,
+        if breaker_open(service_url):
+            return jsonify({'error': f'Service unavailable: {service_url}'}), 503
+        
+        # Forward the raw body bytes; nothing is parsed or re-encoded here
+        response = http.request(method, url, data=body, headers=headers, timeout=HTTP_TIMEOUT, stream=True)
+        
+        # Relay the body as it arrives, still encoded as the backend sent it,
+        # with the backend's headers (ETag, Content-Encoding, ...) except the
+        # per-hop ones and CORS, which the gateway sets itself; the pooled
+        # connection is released once the client has read everything
+        relayed = [
+            (k, v) for k, v in response.headers.items()
+            if k.lower() not in HOP_BY_HOP and k.lower() not in GATEWAY_HEADERS
+            and not k.lower().startswith('access-control-')
+        ]
+        if 'Content-Length' in response.headers:
+            relayed.append(('Content-Length', response.headers['Content-Length']))
+        if 'Content-Type' not in response.headers:
+            relayed.append(('Content-Type', 'application/json'))
+        proxied = Response(
+            response.raw.stream(PROXY_CHUNK_SIZE, decode_content=False),
             status=response.status_code,
-            content_type=response.headers.get('Content-Type', 'application/json')
+            headers=relayed
         )
+        proxied.call_on_close(response.close)
+        record_success(service_url)
+        return proxied
     
     except requests.exceptions.ConnectionError:
+        record_failure(service_url)
         return jsonify({'error': f'Service unavailable: {service_url}'}), 503
     except requests.exceptions.Timeout:
+        record_failure(service_url)
         return jsonify({'error': 'Service timeout'}), 504
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -587,18 +843,17 @@ def proxy_request(service_url, path, method='GET', data=None):
 
 @app.route('/api/users', methods=['GET', 'POST'])
 @token_required
-@role_required('admin')
+@role_required(Role.ADMIN)
 def api_users_list():
     """Admin only: List or create users"""
     if request.method == 'GET':
         # Get all users
-        conn = get_db()
-        users = conn.execute("""
-            SELECT id, email, name, role, created_at 
-            FROM users 
-            ORDER BY created_at DESC
-        """).fetchall()
-        conn.close()
+        with get_db() as conn:
+            users = conn.execute("""
+                SELECT id, email, name, role, created_at 
+                FROM users 
+                ORDER BY created_at DESC
+            """).fetchall()
         
         return jsonify({
             'users': [dict(user) for user in users]
@@ -609,7 +864,7 @@ def api_users_list():
 
 @app.route('/api/users/<user_id>', methods=['GET', 'PUT', 'DELETE'])
 @token_required
-@role_required('admin')
+@role_required(Role.ADMIN)
 def api_users_detail(user_id):
     """Admin only: Get, update, or delete user"""
     if request.method == 'GET':
@@ -621,179 +876,186 @@ def api_users_detail(user_id):
 
 @app.route('/api/users/by-role/<role>', methods=['GET'])
 @token_required
-@role_required('admin')
+@role_required(Role.ADMIN)
 def api_users_by_role(role):
     """Admin only: Get users by role"""
-    conn = get_db()
-    users = conn.execute("""
-        SELECT id, email, name, role, created_at 
-        FROM users 
-        WHERE role = ?
-        ORDER BY created_at DESC
-    """, (role,)).fetchall()
-    conn.close()
+    with get_db() as conn:
+        users = conn.execute("""
+            SELECT id, email, name, role, created_at 
+            FROM users 
+            WHERE role = ?
+            ORDER BY created_at DESC
+        """, (role,)).fetchall()
     
     return jsonify({
         'users': [dict(user) for user in users]
     }), 200
 
 # ==================== FACULTY/STUDENT ROUTES ====================
-# Booking Service (Port 8001)
-
-@app.route('/api/booking/rooms', methods=['GET'])
-@token_required
-@role_required('faculty', 'student')
-def booking_rooms():
-    """Faculty/Student: List available rooms"""
-    return proxy_request(SERVICES['booking'], '/rooms', 'GET')
+# Backend routes are a static table registered once at import, so each
+# request is dispatched straight to its (method, rule) view by Flask's URL
+# map with no per-request method branching
 
-@app.route('/api/booking/slots', methods=['GET'])
-@token_required
-@role_required('faculty', 'student')
-def booking_slots():
-    """Faculty/Student: List time slots"""
-    return proxy_request(SERVICES['booking'], '/slots', 'GET')
-
-@app.route('/api/booking/bookings', methods=['GET', 'POST'])
-@token_required
-@role_required('faculty', 'student')
-def booking_list():
-    """Faculty/Student: List or create bookings"""
-    if request.method == 'GET':
-        return proxy_request(SERVICES['booking'], '/bookings', 'GET')
-    else:
-        return proxy_request(SERVICES['booking'], '/bookings', 'POST', request.get_json())
+STUDY_ROLES = Role.FACULTY | Role.STUDENT
+ALL_ROLES = Role.ADMIN | Role.FACULTY | Role.STUDENT
 
-@app.route('/api/booking/bookings/<int:booking_id>', methods=['DELETE'])
-@token_required
-@role_required('faculty', 'student')
-def booking_delete(booking_id):
-    """Faculty/Student: Cancel booking"""
-    return proxy_request(SERVICES['booking'], f'/bookings/{booking_id}', 'DELETE')
+# (method, gateway rule, service, upstream path, allowed roles)
+PROXY_ROUTES = (
+    # Booking Service (Port 8001)
+    ('GET', '/api/booking/rooms', 'booking', '/rooms', STUDY_ROLES),
+    ('GET', '/api/booking/slots', 'booking', '/slots', STUDY_ROLES),
+    ('GET', '/api/booking/bookings', 'booking', '/bookings', STUDY_ROLES),
+    ('POST', '/api/booking/bookings', 'booking', '/bookings', STUDY_ROLES),
+    ('DELETE', '/api/booking/bookings/<int:booking_id>', 'booking', '/bookings/{booking_id}', STUDY_ROLES),
+    ('GET', '/api/booking/bookings/<string:date>', 'booking', '/bookings/{date}', STUDY_ROLES),
+    ('GET', '/api/booking/my-bookings', 'booking', '/my-bookings', STUDY_ROLES),
+    # GPA Calculator Service (Port 8003)
+    ('POST', '/api/gpa/calculate', 'gpa', '/calculate', STUDY_ROLES),
+    # Notification Service (Port 8004)
+    ('GET', '/api/notifications', 'notifications', '/notifications', ALL_ROLES),
+    ('POST', '/api/notifications', 'notifications', '/notifications', ALL_ROLES),
+    ('PUT', '/api/notifications/<notif_id>/read', 'notifications', '/notifications/{notif_id}/read', ALL_ROLES),
+    ('GET', '/api/notifications/unread', 'notifications', '/notifications/unread', ALL_ROLES),
+    # Maintenance Service (Port 8080); new tickets go through the analyzer
+    ('GET', '/api/maintenance/tickets', 'maintenance', '/tickets', STUDY_ROLES),
+    ('POST', '/api/maintenance/tickets', 'maintenance', '/analyze', STUDY_ROLES),
+    ('GET', '/api/maintenance/tickets/<ticket_id>', 'maintenance', '/tickets/{ticket_id}', STUDY_ROLES),
+    ('PUT', '/api/maintenance/tickets/<ticket_id>', 'maintenance', '/tickets/{ticket_id}', STUDY_ROLES),
+    ('DELETE', '/api/maintenance/tickets/<ticket_id>', 'maintenance', '/tickets/{ticket_id}', STUDY_ROLES),
+)
 
-@app.route('/api/booking/bookings/<string:date>', methods=['GET'])
-@token_required
-@role_required('faculty', 'student')
-def booking_by_date(date):
-    """Faculty/Student: Get bookings for a specific date"""
-    # Forward query parameters (like room_id)
-    query_string = '?' + request.query_string.decode() if request.query_string else ''
-    return proxy_request(SERVICES['booking'], f'/bookings/{date}{query_string}', 'GET')
-
-@app.route('/api/booking/my-bookings', methods=['GET'])
-@token_required
-@role_required('faculty', 'student')
-def booking_my():
-    """Faculty/Student: Get my bookings"""
-    return proxy_request(SERVICES['booking'], '/my-bookings', 'GET')
+def make_proxy_view(method, service, upstream, roles):
+    """Build the view that forwards one (method, rule) pair to its backend"""
+    service_url = SERVICES[service]
+    forward_body = method in ('POST', 'PUT')
+    # Full backend URL built once; only routes with path parameters format it per call
+    backend_url = service_url + upstream
+    has_params = '{' in upstream
+    
+    @token_required
+    @role_required(roles)
+    def proxy_view(**params):
+        url = backend_url.format(**params) if has_params else backend_url
+        # Forward query parameters (like room_id)
+        if request.query_string:
+            url += '?' + request.query_string.decode()
+        body = request.get_data() if forward_body else None
+        return proxy_request(service_url, url, method, body)
+    return proxy_view
 
-# GPA Calculator Service (Port 8003)
+# endpoint -> (service URL, full backend URL template, role bits), for /api/batch
+PROXY_ENDPOINTS = {}
 
-@app.route('/api/gpa/calculate', methods=['POST'])
-@token_required
-@role_required('faculty', 'student')
-def gpa_calculate():
-    """Faculty/Student: Calculate GPA"""
-    return proxy_request(SERVICES['gpa'], '/calculate', 'POST', request.get_json())
+for method, rule, service, upstream, roles in PROXY_ROUTES:
+    app.add_url_rule(rule, endpoint=f'{method} {rule}', methods=[method],
+                     view_func=make_proxy_view(method, service, upstream, roles))
+    PROXY_ENDPOINTS[f'{method} {rule}'] = (SERVICES[service], SERVICES[service] + upstream, int(roles))
 
-# Notification Service (Port 8004)
+# Batch: several proxied calls in one client round-trip, fanned out in parallel
+BATCH_MAX_REQUESTS = 100
+BATCH_TIMEOUT = (1, 5)
+batch_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix='batch')
 
-@app.route('/api/notifications', methods=['GET', 'POST'])
-@token_required
-@role_required('admin', 'faculty', 'student')
-def notifications_list():
-    """Admin/Faculty/Student: List or create notifications"""
-    if request.method == 'GET':
-        return proxy_request(SERVICES['notifications'], '/notifications', 'GET')
-    else:
-        return proxy_request(SERVICES['notifications'], '/notifications', 'POST', request.get_json())
+def run_batch_item(service_url, method, url, body, headers):
+    """Call one backend for a batch item and return (status, parsed body)"""
+    if breaker_open(service_url):
+        return 503, {'error': f'Service unavailable: {service_url}'}
+    try:
+        response = http.request(method, url, json=body, headers=headers, timeout=BATCH_TIMEOUT)
+    except requests.exceptions.ConnectionError:
+        record_failure(service_url)
+        return 503, {'error': f'Service unavailable: {service_url}'}
+    except requests.exceptions.Timeout:
+        record_failure(service_url)
+        return 504, {'error': 'Service timeout'}
+    record_success(service_url)
+    
+    try:
+        return response.status_code, json_loads(response.content) if response.content else None
+    except ValueError:
+        return response.status_code, response.text
 
-@app.route('/api/notifications/<notif_id>/read', methods=['PUT'])
+@app.route('/api/batch', methods=['POST'])
 @token_required
-@role_required('admin', 'faculty', 'student')
-def notifications_read(notif_id):
-    """Admin/Faculty/Student: Mark notification as read"""
-    return proxy_request(SERVICES['notifications'], f'/notifications/{notif_id}/read', 'PUT')
+def api_batch():
+    """Run up to 100 proxied API calls in parallel; each item keeps its own status
 
-@app.route('/api/notifications/unread', methods=['GET'])
-@token_required
-@role_required('admin', 'faculty', 'student')
-def notifications_unread():
-    """Admin/Faculty/Student: Get unread count"""
-    return proxy_request(SERVICES['notifications'], '/notifications/unread', 'GET')
+    Body: {"requests": [{"id": ..., "method": "GET", "path": "/api/booking/rooms", "body": ...}, ...]}
+    """
+    data = request.get_json(silent=True)
+    items = data.get('requests') if isinstance(data, dict) else None
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'Missing required field: requests'}), 400
+    if len(items) > BATCH_MAX_REQUESTS:
+        return jsonify({'error': f'At most {BATCH_MAX_REQUESTS} requests per batch'}), 400
+    
+    # Items are routed with the gateway's own URL map and role checks
+    adapter = app.url_map.bind('localhost')
+    headers = {'Authorization': request.headers['Authorization'], 'X-Correlation-Id': request.correlation_id}
+    pending = []
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            pending.append((None, (400, {'error': 'Each request needs a path'})))
+            continue
+        
+        method = str(item.get('method', 'GET')).upper()
+        path, _, query = item['path'].partition('?')
+        try:
+            endpoint, params = adapter.match(path, method)
+        except HTTPException as e:
+            pending.append((item.get('id'), (e.code, {'error': e.name})))
+            continue
+        
+        route = PROXY_ENDPOINTS.get(endpoint)
+        if route is None:
+            pending.append((item.get('id'), (404, {'error': 'Not available in a batch'})))
+            continue
+        service_url, backend_url, required = route
+        if not g.user['role_bits'] & required:
+            pending.append((item.get('id'), (403, {'error': 'Insufficient permissions'})))
+            continue
+        
+        url = backend_url.format(**params) + (f'?{query}' if query else '')
+        body = item.get('body') if method in ('POST', 'PUT') else None
+        pending.append((item.get('id'), batch_pool.submit(run_batch_item, service_url, method, url, body, headers)))
+    
+    responses = []
+    for item_id, outcome in pending:
+        status, body = outcome if isinstance(outcome, tuple) else outcome.result()
+        responses.append({'id': item_id, 'status': status, 'body': body})
+    
+    return jsonify({'responses': responses}), 200
 
 # Maintenance Service (Port 8080) - WebSocket handled separately
 
+MAINTENANCE_INFO_BODY = json_dumps({
+    'service': 'Maintenance Ticketing',
+    'port': 8080,
+    'type': 'WebSocket',
+    'url': 'ws://localhost:8080',
+    'frontend': 'http://localhost:8080/websocket_frontend.html'
+})
+
 @app.route('/api/maintenance/info', methods=['GET'])
 @token_required
-@role_required('faculty', 'student')
+@role_required(Role.FACULTY | Role.STUDENT)
 def maintenance_info():
     """Faculty/Student: Get maintenance service info"""
-    return jsonify({
-        'service': 'Maintenance Ticketing',
-        'port': 8080,
-        'type': 'WebSocket',
-        'url': 'ws://localhost:8080',
-        'frontend': 'http://localhost:8080/websocket_frontend.html'
-    }), 200
-
-@app.route('/api/maintenance/tickets', methods=['GET', 'POST'])
-@token_required
-@role_required('faculty', 'student')
-def maintenance_tickets():
-    """Faculty/Student: Get all tickets or create new ticket"""
-    if request.method == 'GET':
-        # GET - Return all tickets
-        return proxy_request(SERVICES['maintenance'], '/tickets', 'GET')
-    else:  # POST
-        # POST - Create ticket by analyzing the request
-        return proxy_request(SERVICES['maintenance'], '/analyze', 'POST', request.get_json())
-
-@app.route('/api/maintenance/tickets/<ticket_id>', methods=['GET', 'PUT', 'DELETE'])
-@token_required
-@role_required('faculty', 'student')
-def maintenance_ticket_detail(ticket_id):
-    """Faculty/Student: Get, update, or delete specific ticket"""
-    return proxy_request(SERVICES['maintenance'], f'/tickets/{ticket_id}', request.method, request.get_json() if request.method == 'PUT' else None)
+    return Response(MAINTENANCE_INFO_BODY, status=200, mimetype='application/json')
 
 # ============================================================
 # Frontend Routes - Serve HTML Pages
 # ============================================================
 
-@app.route('/login.html')
-def login_page():
-    """Serve login page"""
-    return send_from_directory('static', 'login.html')
+PAGES = frozenset({'login', 'dashboard', 'booking', 'gpa', 'users', 'maintenance', 'notifications'})
 
-@app.route('/dashboard.html')
-def dashboard_page():
-    """Serve dashboard page"""
-    return send_from_directory('static', 'dashboard.html')
-
-@app.route('/booking.html')
-def booking_page():
-    """Serve booking page"""
-    return send_from_directory('static', 'booking.html')
-
-@app.route('/gpa.html')
-def gpa_page():
-    """Serve GPA calculator page"""
-    return send_from_directory('static', 'gpa.html')
-
-@app.route('/users.html')
-def users_page():
-    """Serve user management page"""
-    return send_from_directory('static', 'users.html')
-
-@app.route('/maintenance.html')
-def maintenance_page():
-    """Serve maintenance page"""
-    return send_from_directory('static', 'maintenance.html')
-
-@app.route('/notifications.html')
-def notifications_page():
-    """Serve notifications page"""
-    return send_from_directory('static', 'notifications.html')
+@app.route('/<page>.html')
+def serve_page(page):
+    """Serve a frontend page; browsers may reuse it for an hour"""
+    if page not in PAGES:
+        abort(404)
+    return send_from_directory('static', page + '.html', max_age=3600)
 
 if __name__ == '__main__':
     logger.info("🚪 API Gateway Hub starting on port 5001...", extra={'correlation_id': 'startup'})
@@ -4,31 +4,66 @@ Stateless weighted GPA calculation
 Port: 8003
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, Response
 from flask_cors import CORS
 import jwt
-from functools import wraps
+import numpy as np
+from functools import lru_cache, wraps
+from logging.handlers import QueueHandler, QueueListener
+import atexit
 import logging
-import uuid
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - [%(correlation_id)s] - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('/tmp/gpa.log'),
-        logging.StreamHandler()
-    ]
-)
+import os
+import queue
+import secrets
+import time
+
+try:
+    from orjson import dumps as _orjson_dumps
+    def json_dumps(obj):
+        return _orjson_dumps(obj).decode('utf-8')
+except ImportError:
+    from json import dumps as json_dumps
+
+class JSONLogFormatter(logging.Formatter):
+    """One JSON object per line; records from other libraries get cid '-'"""
+    def format(self, record):
+        return json_dumps({
+            'ts': record.created,
+            'lvl': record.levelname,
+            'logger': record.name,
+            'cid': getattr(record, 'correlation_id', '-'),
+            'msg': record.getMessage()
+        })
+
+# Configure logging: request handlers only enqueue records, a listener
+# thread formats them as JSON and does the file and console writes
+log_handler = QueueHandler(queue.Queue(-1))
+logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[log_handler])
 logger = logging.getLogger(__name__)
 
+log_listener = None
+
+def start_log_listener():
+    """Start the thread that drains the log queue (again in each forked worker)"""
+    global log_listener
+    log_handler.queue = queue.Queue(-1)
+    handlers = [logging.FileHandler('/tmp/gpa.log'), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(JSONLogFormatter())
+    log_listener = QueueListener(log_handler.queue, *handlers)
+    log_listener.start()
+
+start_log_listener()
+os.register_at_fork(after_in_child=start_log_listener)
+atexit.register(lambda: log_listener.stop())
+
 app = Flask(__name__)
-CORS(app)
+CORS(app, send_wildcard=True, max_age=86400)
 
 # Add correlation ID to all requests
 @app.before_request
 def before_request():
-    request.correlation_id = str(uuid.uuid4())
+    request.correlation_id = request.headers.get('X-Correlation-Id') or secrets.token_hex(8)
     logger.info(f"Request started: {request.method} {request.path}",
                 extra={'correlation_id': request.correlation_id})
 
@@ -42,6 +77,77 @@ def after_request(response):
 SECRET_KEY = 'your-secret-key-change-in-production'
 ALGORITHM = 'HS256'
 
+# Decoder and key are built once instead of re-marshalled on every decode.
+# Every token the gateway issues carries exp, so it's required here too.
+_jwt = jwt.PyJWT(options={'require': ['exp'], 'verify_exp': True})
+_KEY = SECRET_KEY.encode('utf-8')
+
+@lru_cache(maxsize=4096)
+def _decode(token):
+    """Verify and decode a token; repeated tokens skip the HMAC and JSON parse"""
+    return _jwt.decode(token, _KEY, algorithms=[ALGORITHM])
+
+# Per-column (gpa, weight) bounds, broadcast across every class at once
+GRADE_MIN = np.array([0.0, 1.0])
+GRADE_MAX = np.array([4.0, 3.0])
+
+def _weighted_totals_numpy(grades):
+    """Range-check and total an (N, 2) array of (gpa, weight) rows
+
+    Returns (total_weighted, total_weight, bad_row, bad_col); bad_row is -1
+    when every class is in range, otherwise the first bad row with its GPA
+    (column 0) reported ahead of its weight (column 1).
+    """
+    # One fused pass over both columns; row-major order finds the first bad cell
+    bad = (grades < GRADE_MIN) | (grades > GRADE_MAX)
+    if bad.any():
+        row, col = np.argwhere(bad)[0]
+        return 0.0, 0.0, int(row), int(col)
+    gpas, weights = grades[:, 0], grades[:, 1]
+    return float(np.dot(gpas, weights)), float(weights.sum()), -1, -1
+
+try:
+    from numba import njit
+except ImportError:
+    weighted_totals = _weighted_totals_numpy
+else:
+    @njit(cache=True)
+    def _weighted_totals_jit(grades):
+        """Compiled single loop: validate and accumulate each row in one pass"""
+        total_weighted = 0.0
+        total_weight = 0.0
+        for i in range(grades.shape[0]):
+            gpa = grades[i, 0]
+            weight = grades[i, 1]
+            if gpa < 0.0 or gpa > 4.0:
+                return 0.0, 0.0, i, 0
+            if weight < 1.0 or weight > 3.0:
+                return 0.0, 0.0, i, 1
+            total_weighted += gpa * weight
+            total_weight += weight
+        return total_weighted, total_weight, -1, -1
+
+    def weighted_totals(grades):
+        total_weighted, total_weight, bad_row, bad_col = _weighted_totals_jit(grades)
+        return total_weighted, total_weight, int(bad_row), int(bad_col)
+
+    # Compile at import so the first request doesn't pay for the JIT
+    weighted_totals(np.array([[4.0, 1.0]]))
+
+def grade_array(classes):
+    """(N, 2) float64 array of (gpa, weight) rows in one C-level conversion"""
+    return np.array([(cls['gpa'], cls['weight']) for cls in classes], dtype=np.float64).reshape(-1, 2)
+
+def non_numeric_class(classes):
+    """Index of the first class whose gpa or weight isn't a number, or len(classes)"""
+    for i, cls in enumerate(classes):
+        try:
+            if float(cls['gpa']) != float(cls['gpa']) or float(cls['weight']) != float(cls['weight']):
+                return i
+        except (ValueError, TypeError):
+            return i
+    return len(classes)
+
 # JWT Middleware
 def token_required(f):
     @wraps(f)
@@ -59,33 +165,42 @@ def token_required(f):
             return jsonify({'error': 'Token is missing'}), 401
         
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            request.user = payload
+            payload = _decode(token)
         except jwt.ExpiredSignatureError:
             return jsonify({'error': 'Token expired'}), 401
         except jwt.InvalidTokenError:
             return jsonify({'error': 'Invalid token'}), 401
         
+        # Cached payloads outlive the decode-time expiry check
+        if payload['exp'] <= time.time():
+            return jsonify({'error': 'Token expired'}), 401
+        
+        request.user = dict(payload)
         return f(*args, **kwargs)
     
     return decorated
 
+# Static payloads are serialized once at import time
+HEALTH_BODY = json_dumps({
+    'status': 'healthy',
+    'service': 'gpa-calculator',
+    'version': '2.0.0'
+})
+
+HOME_BODY = json_dumps({
+    'service': 'GPA Calculator Service',
+    'version': '2.0.0',
+    'features': ['JWT Auth', 'Weighted GPA Calculation'],
+    'formula': 'Weighted GPA = Σ(gpa × weight) / Σ(weight)'
+})
+
 @app.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({
-        'status': 'healthy',
-        'service': 'gpa-calculator',
-        'version': '2.0.0'
-    }), 200
+    return Response(HEALTH_BODY, status=200, mimetype='application/json')
 
 @app.route('/', methods=['GET'])
 def home():
-    return jsonify({
-        'service': 'GPA Calculator Service',
-        'version': '2.0.0',
-        'features': ['JWT Auth', 'Weighted GPA Calculation'],
-        'formula': 'Weighted GPA = Σ(gpa × weight) / Σ(weight)'
-    }), 200
+    return Response(HOME_BODY, status=200, mimetype='application/json')
 
 @app.route('/calculate', methods=['POST'])
 @token_required
@@ -111,29 +226,30 @@ def calculate_gpa():
         if not classes or len(classes) == 0:
             return jsonify({'error': 'Classes array cannot be empty'}), 400
         
-        total_weighted = 0
-        total_weight = 0
+        # Each class is checked for keys, then format, then range, and the
+        # first class failing any check is reported. The first class missing
+        # a key bounds the format check, and the first non-numeric class
+        # bounds the range check.
+        missing_key = next((i for i, cls in enumerate(classes)
+                            if 'gpa' not in cls or 'weight' not in cls), len(classes))
+        try:
+            grades = grade_array(classes[:missing_key])
+        except (ValueError, TypeError):
+            grades = None
+        non_numeric = missing_key
+        if grades is None or np.isnan(grades).any():
+            non_numeric = non_numeric_class(classes[:missing_key])
+            grades = grade_array(classes[:non_numeric])
         
-        for i, cls in enumerate(classes):
-            if 'gpa' not in cls or 'weight' not in cls:
-                return jsonify({'error': 'Each class must have gpa and weight'}), 400
-            
-            try:
-                gpa = float(cls['gpa'])
-                weight = float(cls['weight'])
-            except (ValueError, TypeError):
-                return jsonify({'error': f'Error: Improper format. Class {i+1} has non-numeric values. GPA and weight must be numbers.'}), 400
-            
-            # Validate GPA range
-            if gpa < 0.0 or gpa > 4.0:
-                return jsonify({'error': f'GPA must be between 0.0 and 4.0, got {gpa}'}), 400
-            
-            # Validate weight range
-            if weight < 1 or weight > 3:
-                return jsonify({'error': f'Weight must be between 1 and 3, got {weight}'}), 400
-            
-            total_weighted += gpa * weight
-            total_weight += weight
+        total_weighted, total_weight, bad_row, bad_col = weighted_totals(grades)
+        if bad_row >= 0:
+            if bad_col == 0:
+                return jsonify({'error': f'GPA must be between 0.0 and 4.0, got {float(grades[bad_row, 0])}'}), 400
+            return jsonify({'error': f'Weight must be between 1 and 3, got {float(grades[bad_row, 1])}'}), 400
+        if non_numeric < missing_key:
+            return jsonify({'error': f'Error: Improper format. Class {non_numeric+1} has non-numeric values. GPA and weight must be numbers.'}), 400
+        if missing_key < len(classes):
+            return jsonify({'error': 'Each class must have gpa and weight'}), 400
         
         if total_weight == 0:
             return jsonify({'error': 'Total weight cannot be zero'}), 400
@@ -157,4 +273,4 @@ if __name__ == '__main__':
     print("📐 Formula: Weighted GPA = Σ(gpa × weight) / Σ(weight)")
     print("✅ GPA range: 0.0 - 4.0")
     print("✅ Weight range: 1 - 3")
-    app.run(host='0.0.0.0', port=8003, debug=True)
+    app.run(host='0.0.0.0', port=8003, debug=False)
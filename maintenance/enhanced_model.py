@@ -9,82 +9,207 @@ from datetime import datetime
 from typing import Dict, List, Tuple
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
+from bisect import bisect_right
 from collections import Counter
+from functools import lru_cache
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+# Priority levels, highest first: (minimum score, priority, description, SLA)
+PRIORITY_LEVELS = (
+    (40.0, 'CRITICAL', 'P0 - Critical: Immediate Response Required', '15 minutes'),
+    (25.0, 'HIGH', 'P1 - High: Respond within 1 hour', '1 hour'),
+    (12.0, 'MEDIUM', 'P2 - Medium: Respond within 4 hours', '4 hours'),
+    (5.0, 'LOW', 'P3 - Low: Respond within 24 hours', '24 hours'),
+    (float('-inf'), 'ROUTINE', 'P4 - Routine: Scheduled maintenance', '48-72 hours')
+)
+
+# Minimum scores above the ROUTINE floor in ascending order; the number a
+# score reaches counts up from ROUTINE, so len() minus it is the level
+SCORE_LADDER = tuple(threshold for threshold, *_ in reversed(PRIORITY_LEVELS[:-1]))
+
+
+# Keyword tables. They're static, so they and everything derived from them
+# are built once at import and shared by every model instance.
+
+# Critical keywords with semantic patterns
+CRITICAL_PATTERNS = {
+    'outage': ['down', 'outage', 'offline', 'unavailable', 'crashed', 'not responding'],
+    'security': ['breach', 'hacked', 'ransomware', 'malware', 'virus', 'unauthorized access'],
+    'data_loss': ['data loss', 'deleted', 'corrupted', 'backup failed', 'cannot recover'],
+    'emergency': ['emergency', 'urgent', 'critical', 'fire', 'flood', 'gas leak', 'electrical hazard'],
+    'access_blocked': ['cannot access', 'locked out', 'denied', 'blocked', 'forbidden'],
+    'total_failure': ['complete failure', 'total loss', 'entire system', 'all services']
+}
+
+HIGH_PATTERNS = {
+    'major_error': ['error', 'failing', 'broken', 'not working', 'malfunctioning'],
+    'performance': ['very slow', 'extremely slow', 'timeout', 'hanging', 'freezing'],
+    'connectivity': ['connection', 'network issue', 'vpn', 'cannot connect'],
+    'auth_issues': ['cannot login', 'login failed', 'password', 'authentication'],
+    'facility_urgent': ['water leak', 'leaking', 'hvac', 'no cooling', 'no heating', 'pipe burst']
+}
+
+MEDIUM_PATTERNS = {
+    'requests': ['install', 'upgrade', 'update', 'configure', 'setup'],
+    'minor_issues': ['sometimes', 'intermittent', 'occasional', 'glitch'],
+    'access_request': ['need access', 'request access', 'permission']
+}
+
+# First word of each pattern, used to locate it for negation checks
+PATTERN_HEADS = {
+    pattern: pattern.split()[0]
+    for patterns in (*CRITICAL_PATTERNS.values(), *HIGH_PATTERNS.values())
+    for pattern in patterns
+}
+
+# Negation words that reduce severity
+NEGATIONS = frozenset(('not', 'no', 'none', 'neither', 'never', 'nobody'))
+
+# Severity modifiers
+INTENSIFIERS = {
+    'extreme': 2.0, 'critical': 1.8, 'severe': 1.7, 'major': 1.6,
+    'urgent': 1.5, 'serious': 1.4, 'important': 1.3, 'significant': 1.3
+}
+
+DIMINISHERS = {
+    'minor': 0.6, 'small': 0.7, 'slight': 0.7, 'little': 0.8,
+    'maybe': 0.8, 'possibly': 0.8, 'occasionally': 0.7
+}
+
+# System impact weights
+SYSTEM_WEIGHTS = {
+    'production': 2.5, 'prod': 2.5, 'live': 2.3,
+    'database': 2.2, 'db': 2.2, 'server': 2.0,
+    'network': 2.0, 'security': 2.3, 'firewall': 2.2,
+    'domain controller': 2.2, 'active directory': 2.1,
+    'backup': 2.0, 'email': 1.8, 'vpn': 1.8,
+    'web': 1.7, 'application': 1.5, 'app': 1.5,
+    'workstation': 1.3, 'laptop': 1.2, 'desktop': 1.2,
+    'printer': 1.1, 'scanner': 1.1,
+    # Physical infrastructure
+    'building': 2.0, 'infrastructure': 1.9, 'facility': 1.8,
+    'data center': 2.5, 'server room': 2.3,
+    'electrical': 2.2, 'hvac': 2.0, 'plumbing': 1.9,
+    'basement': 1.6
+}
+
+# Impact scope
+SCOPE_WEIGHTS = {
+    'all users': 3.0, 'everyone': 3.0, 'entire company': 3.0,
+    'entire department': 2.5, 'whole team': 2.3, 'department': 2.2,
+    'multiple users': 2.0, 'several users': 1.8, 'team': 1.7,
+    'few users': 1.3, 'one user': 1.0
+}
+
+# Urgency regexes with their scores and display labels
+URGENCY_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), score,
+     pattern.replace(r'\b', '').replace('(', '').replace(')', ''))
+    for pattern, score in (
+        (r'\b(emergency|urgent|critical|asap|immediately|right now)\b', 5.0),
+        (r'\b(can\'t work|cannot work|blocking|stopped|stuck)\b', 4.0),
+        (r'\b(today|this morning|this afternoon|now)\b', 2.5),
+        (r'\b(soon|quickly|priority|important)\b', 1.5)
+    )
+]
+
+# RE2 runs the urgency alternations as a DFA. Its \b is ASCII-only, so it
+# only takes ASCII text; anything else keeps Python's Unicode rules
+if re2 is not None:
+    _re2_options = re2.Options()
+    _re2_options.case_sensitive = False
+    ASCII_URGENCY_PATTERNS = [
+        (re2.compile(regex.pattern, _re2_options), score, label)
+        for regex, score, label in URGENCY_PATTERNS
+    ]
+else:
+    ASCII_URGENCY_PATTERNS = URGENCY_PATTERNS
+
+# Everything but lowercase letters, digits and whitespace
+NON_WORD_RE = re.compile(r'[^a-z0-9\s]')
+
+
+def build_keyword_index():
+    """Tag every keyword from every table and compile them into one automaton
+
+    Each keyword maps to a tuple of (order, kind, keyword, weight) tags, with
+    order following the tables above so matches are applied in the same
+    sequence as scanning each table in turn. The automaton is None when
+    pyahocorasick isn't installed.
+    """
+    tables = (
+        *(('CRITICAL', dict.fromkeys(patterns, 10.0)) for patterns in CRITICAL_PATTERNS.values()),
+        *(('HIGH', dict.fromkeys(patterns, 6.0)) for patterns in HIGH_PATTERNS.values()),
+        *(('MEDIUM', dict.fromkeys(patterns, 3.0)) for patterns in MEDIUM_PATTERNS.values()),
+        ('Intensifier', INTENSIFIERS),
+        ('Diminisher', DIMINISHERS),
+        ('system', SYSTEM_WEIGHTS),
+        ('scope', SCOPE_WEIGHTS)
+    )
+    tags = {}
+    order = 0
+    for kind, weights in tables:
+        for keyword, weight in weights.items():
+            tags.setdefault(keyword, []).append((order, kind, keyword, weight))
+            order += 1
+    tags = {keyword: tuple(keyword_tags) for keyword, keyword_tags in tags.items()}
+    
+    # The automaton hands back a keyword's tags directly, no second lookup
+    automaton = None
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword, keyword_tags in tags.items():
+            automaton.add_word(keyword, keyword_tags)
+        automaton.make_automaton()
+    return tags, automaton
+
+
+KEYWORD_TAGS, KEYWORD_AUTOMATON = build_keyword_index()
+
+# Distinct ticket texts whose analysis is kept for reuse
+ANALYSIS_CACHE_SIZE = 4096
 
 
 class EnhancedMaintenanceNLP:
     """Advanced NLP model for maintenance ticket priority assignment"""
     
     def __init__(self):
-        # Critical keywords with semantic patterns
-        self.critical_patterns = {
-            'outage': ['down', 'outage', 'offline', 'unavailable', 'crashed', 'not responding'],
-            'security': ['breach', 'hacked', 'ransomware', 'malware', 'virus', 'unauthorized access'],
-            'data_loss': ['data loss', 'deleted', 'corrupted', 'backup failed', 'cannot recover'],
-            'emergency': ['emergency', 'urgent', 'critical', 'fire', 'flood', 'gas leak', 'electrical hazard'],
-            'access_blocked': ['cannot access', 'locked out', 'denied', 'blocked', 'forbidden'],
-            'total_failure': ['complete failure', 'total loss', 'entire system', 'all services']
-        }
-        
-        self.high_patterns = {
-            'major_error': ['error', 'failing', 'broken', 'not working', 'malfunctioning'],
-            'performance': ['very slow', 'extremely slow', 'timeout', 'hanging', 'freezing'],
-            'connectivity': ['connection', 'network issue', 'vpn', 'cannot connect'],
-            'auth_issues': ['cannot login', 'login failed', 'password', 'authentication'],
-            'facility_urgent': ['water leak', 'leaking', 'hvac', 'no cooling', 'no heating', 'pipe burst']
-        }
-        
-        self.medium_patterns = {
-            'requests': ['install', 'upgrade', 'update', 'configure', 'setup'],
-            'minor_issues': ['sometimes', 'intermittent', 'occasional', 'glitch'],
-            'access_request': ['need access', 'request access', 'permission']
-        }
-        
-        # Negation words that reduce severity
-        self.negations = ['not', 'no', 'none', 'neither', 'never', 'nobody']
-        
-        # Severity modifiers
-        self.intensifiers = {
-            'extreme': 2.0, 'critical': 1.8, 'severe': 1.7, 'major': 1.6,
-            'urgent': 1.5, 'serious': 1.4, 'important': 1.3, 'significant': 1.3
-        }
-        
-        self.diminishers = {
-            'minor': 0.6, 'small': 0.7, 'slight': 0.7, 'little': 0.8,
-            'maybe': 0.8, 'possibly': 0.8, 'occasionally': 0.7
-        }
-        
-        # System impact weights
-        self.system_weights = {
-            'production': 2.5, 'prod': 2.5, 'live': 2.3,
-            'database': 2.2, 'db': 2.2, 'server': 2.0,
-            'network': 2.0, 'security': 2.3, 'firewall': 2.2,
-            'domain controller': 2.2, 'active directory': 2.1,
-            'backup': 2.0, 'email': 1.8, 'vpn': 1.8,
-            'web': 1.7, 'application': 1.5, 'app': 1.5,
-            'workstation': 1.3, 'laptop': 1.2, 'desktop': 1.2,
-            'printer': 1.1, 'scanner': 1.1,
-            # Physical infrastructure
-            'building': 2.0, 'infrastructure': 1.9, 'facility': 1.8,
-            'data center': 2.5, 'server room': 2.3,
-            'electrical': 2.2, 'hvac': 2.0, 'plumbing': 1.9,
-            'basement': 1.6
-        }
-        
-        # Impact scope
-        self.scope_weights = {
-            'all users': 3.0, 'everyone': 3.0, 'entire company': 3.0,
-            'entire department': 2.5, 'whole team': 2.3, 'department': 2.2,
-            'multiple users': 2.0, 'several users': 1.8, 'team': 1.7,
-            'few users': 1.3, 'one user': 1.0
-        }
-        
+        self.critical_patterns = CRITICAL_PATTERNS
+        self.high_patterns = HIGH_PATTERNS
+        self.medium_patterns = MEDIUM_PATTERNS
+        self.pattern_heads = PATTERN_HEADS
+        self.negations = NEGATIONS
+        self.intensifiers = INTENSIFIERS
+        self.diminishers = DIMINISHERS
+        self.system_weights = SYSTEM_WEIGHTS
+        self.scope_weights = SCOPE_WEIGHTS
+        self.urgency_patterns = URGENCY_PATTERNS
+        self.ascii_urgency_patterns = ASCII_URGENCY_PATTERNS
+        self.non_word_re = NON_WORD_RE
+        self.keyword_tags = KEYWORD_TAGS
+        self.automaton = KEYWORD_AUTOMATON
+        
+        # Analysis is deterministic in the text, so retried or templated
+        # tickets reuse the features of an earlier identical one. Callers
+        # must treat the returned features as read-only.
+        self.cached_text_features = lru_cache(maxsize=ANALYSIS_CACHE_SIZE)(self.text_features)
+    
     def preprocess_text(self, text: str) -> List[str]:
         """Clean and tokenize text"""
         # Convert to lowercase
         text = text.lower()
         # Remove special characters but keep spaces
-        text = re.sub(r'[^a-z0-9\s]', ' ', text)
+        text = self.non_word_re.sub(' ', text)
         # Split into words
         words = text.split()
         return words
@@ -92,173 +217,136 @@ class EnhancedMaintenanceNLP:
     def detect_negation(self, words: List[str], position: int, window: int = 3) -> bool:
         """Check if a keyword is negated"""
         start = max(0, position - window)
-        for i in range(start, position):
-            if words[i] in self.negations:
-                return True
-        return False
+        return not self.negations.isdisjoint(words[start:position])
+    
+    def match_keywords(self, text: str) -> List[Tuple[int, str, str, float]]:
+        """Find every keyword in text and return their tags in table order"""
+        if self.automaton is not None:
+            found = {keyword_tags for _, keyword_tags in self.automaton.iter(text)}
+        else:
+            found = [keyword_tags for keyword, keyword_tags in self.keyword_tags.items() if keyword in text]
+        return sorted(tag for keyword_tags in found for tag in keyword_tags)
     
-    def calculate_pattern_score(self, text: str, words: List[str]) -> Tuple[float, List[str], str]:
+    def calculate_pattern_score(self, matches: List[Tuple], text: str) -> Tuple[float, List[str], str]:
         """Calculate score based on pattern matching with context awareness"""
         score = 0.0
         matched = []
         severity = 'ROUTINE'
-        
-        # Check critical patterns
-        critical_matches = 0
-        for category, patterns in self.critical_patterns.items():
-            for pattern in patterns:
-                if pattern in text:
-                    position = words.index(pattern.split()[0]) if pattern.split()[0] in words else -1
-                    if position == -1 or not self.detect_negation(words, position):
-                        critical_matches += 1
-                        score += 10.0
-                        matched.append(f"CRITICAL:{pattern}")
-                        severity = 'CRITICAL'
-        
-        # Check high priority patterns
-        high_matches = 0
-        for category, patterns in self.high_patterns.items():
-            for pattern in patterns:
-                if pattern in text:
-                    position = words.index(pattern.split()[0]) if pattern.split()[0] in words else -1
-                    if position == -1 or not self.detect_negation(words, position):
-                        high_matches += 1
-                        score += 6.0
-                        matched.append(f"HIGH:{pattern}")
-                        if severity not in ['CRITICAL']:
-                            severity = 'HIGH'
-        
-        # Check medium patterns
-        medium_matches = 0
-        for category, patterns in self.medium_patterns.items():
-            for pattern in patterns:
-                if pattern in text:
-                    medium_matches += 1
-                    score += 3.0
-                    matched.append(f"MEDIUM:{pattern}")
-                    if severity not in ['CRITICAL', 'HIGH']:
-                        severity = 'MEDIUM'
+        words = None  # Tokenized only once a negation check needs it
+        
+        for _, kind, pattern, weight in matches:
+            if kind == 'MEDIUM':
+                # Medium patterns are scored without a negation check
+                if severity == 'ROUTINE':
+                    severity = 'MEDIUM'
+            elif kind == 'CRITICAL' or kind == 'HIGH':
+                if words is None:
+                    words = self.preprocess_text(text)
+                try:
+                    position = words.index(self.pattern_heads[pattern])
+                except ValueError:
+                    position = -1
+                if position != -1 and self.detect_negation(words, position):
+                    continue
+                if severity != 'CRITICAL':
+                    severity = kind
+            else:
+                continue
+            score += weight
+            matched.append(f"{kind}:{pattern}")
         
         return score, matched, severity
     
-    def apply_modifiers(self, text: str, base_score: float) -> Tuple[float, List[str]]:
+    def apply_modifiers(self, matches: List[Tuple], base_score: float) -> Tuple[float, List[str]]:
         """Apply intensity modifiers"""
         score = base_score
         modifiers_applied = []
         
-        # Check for intensifiers
-        for intensifier, multiplier in self.intensifiers.items():
-            if intensifier in text:
+        # Intensifiers, then diminishers
+        for _, kind, modifier, multiplier in matches:
+            if kind == 'Intensifier' or kind == 'Diminisher':
                 score *= multiplier
-                modifiers_applied.append(f"Intensifier: {intensifier} (x{multiplier})")
-        
-        # Check for diminishers
-        for diminisher, multiplier in self.diminishers.items():
-            if diminisher in text:
-                score *= multiplier
-                modifiers_applied.append(f"Diminisher: {diminisher} (x{multiplier})")
+                modifiers_applied.append(f"{kind}: {modifier} (x{multiplier})")
         
         return score, modifiers_applied
     
-    def calculate_system_impact(self, text: str) -> Tuple[float, str]:
+    def calculate_system_impact(self, matches: List[Tuple]) -> Tuple[float, str]:
         """Calculate system impact multiplier"""
-        max_weight = 1.0
-        system_found = 'general'
-        
-        for system, weight in self.system_weights.items():
-            if system in text:
-                if weight > max_weight:
-                    max_weight = weight
-                    system_found = system
-        
-        return max_weight, system_found
+        return self.max_weight(matches, 'system', 'general')
     
-    def calculate_scope_impact(self, text: str) -> Tuple[float, str]:
+    def calculate_scope_impact(self, matches: List[Tuple]) -> Tuple[float, str]:
         """Calculate impact scope multiplier"""
+        return self.max_weight(matches, 'scope', 'single user')
+    
+    def max_weight(self, matches: List[Tuple], kind: str, default: str) -> Tuple[float, str]:
+        """Heaviest matched keyword of one kind; the first one listed wins ties"""
         max_weight = 1.0
-        scope_found = 'single user'
+        found = default
         
-        for scope, weight in self.scope_weights.items():
-            if scope in text:
-                if weight > max_weight:
-                    max_weight = weight
-                    scope_found = scope
+        for _, match_kind, keyword, weight in matches:
+            if match_kind == kind and weight > max_weight:
+                max_weight = weight
+                found = keyword
         
-        return max_weight, scope_found
+        return max_weight, found
     
     def detect_urgency(self, text: str) -> Tuple[float, List[str]]:
         """Detect urgency indicators"""
         urgency_score = 0.0
         urgency_terms = []
         
-        patterns = {
-            r'\b(emergency|urgent|critical|asap|immediately|right now)\b': 5.0,
-            r'\b(can\'t work|cannot work|blocking|stopped|stuck)\b': 4.0,
-            r'\b(today|this morning|this afternoon|now)\b': 2.5,
-            r'\b(soon|quickly|priority|important)\b': 1.5
-        }
-        
-        for pattern, score in patterns.items():
-            if re.search(pattern, text, re.IGNORECASE):
+        patterns = self.ascii_urgency_patterns if text.isascii() else self.urgency_patterns
+        for regex, score, label in patterns:
+            if regex.search(text):
                 urgency_score += score
-                urgency_terms.append(pattern.replace(r'\b', '').replace('(', '').replace(')', ''))
+                urgency_terms.append(label)
         
         return urgency_score, urgency_terms
     
-    def analyze(self, request_data: Dict) -> Dict:
-        """Main analysis method with advanced NLP"""
-        if not request_data or 'description' not in request_data:
-            return {
-                'success': False,
-                'error': 'Missing required field: description'
-            }
-        
+    def extract_features(self, request_data: Dict) -> Dict:
+        """Run the text analysis and collect the per-request scoring inputs"""
         description = request_data['description']
         system = request_data.get('system', '')
         combined_text = f"{description} {system}".lower()
-        
-        # Preprocess
-        words = self.preprocess_text(combined_text)
+        return self.cached_text_features(combined_text)
+    
+    def text_features(self, combined_text: str) -> Dict:
+        """Scoring inputs for one request's combined, lowercased text"""
+        matches = self.match_keywords(combined_text)
         
         # Calculate pattern-based score
-        pattern_score, matched_patterns, base_severity = self.calculate_pattern_score(combined_text, words)
+        pattern_score, matched_patterns, base_severity = self.calculate_pattern_score(matches, combined_text)
         
         # Apply modifiers
-        modified_score, modifiers = self.apply_modifiers(combined_text, pattern_score)
+        modified_score, modifiers = self.apply_modifiers(matches, pattern_score)
         
         # Calculate system impact
-        system_multiplier, system_found = self.calculate_system_impact(combined_text)
+        system_multiplier, system_found = self.calculate_system_impact(matches)
         
         # Calculate scope impact
-        scope_multiplier, scope_found = self.calculate_scope_impact(combined_text)
+        scope_multiplier, scope_found = self.calculate_scope_impact(matches)
         
         # Detect urgency
         urgency_bonus, urgency_terms = self.detect_urgency(combined_text)
         
-        # Calculate final score
-        final_score = (modified_score * system_multiplier * scope_multiplier) + urgency_bonus
-        
-        # Determine priority level
-        if final_score >= 40.0 or 'CRITICAL' in [m.split(':')[0] for m in matched_patterns]:
-            priority = 'CRITICAL'
-            priority_desc = 'P0 - Critical: Immediate Response Required'
-            sla = '15 minutes'
-        elif final_score >= 25.0:
-            priority = 'HIGH'
-            priority_desc = 'P1 - High: Respond within 1 hour'
-            sla = '1 hour'
-        elif final_score >= 12.0:
-            priority = 'MEDIUM'
-            priority_desc = 'P2 - Medium: Respond within 4 hours'
-            sla = '4 hours'
-        elif final_score >= 5.0:
-            priority = 'LOW'
-            priority_desc = 'P3 - Low: Respond within 24 hours'
-            sla = '24 hours'
-        else:
-            priority = 'ROUTINE'
-            priority_desc = 'P4 - Routine: Scheduled maintenance'
-            sla = '48-72 hours'
+        return {
+            'pattern_score': pattern_score,
+            'matched_patterns': matched_patterns,
+            'base_severity': base_severity,
+            'modified_score': modified_score,
+            'modifiers': modifiers,
+            'system_multiplier': system_multiplier,
+            'system_found': system_found,
+            'scope_multiplier': scope_multiplier,
+            'scope_found': scope_found,
+            'urgency_bonus': urgency_bonus,
+            'urgency_terms': urgency_terms
+        }
+    
+    def build_result(self, request_data: Dict, features: Dict, final_score: float, level: int) -> Dict:
+        """Assemble the response for one request from its features and priority level"""
+        _, priority, priority_desc, sla = PRIORITY_LEVELS[level]
+        matched_patterns = features['matched_patterns']
         
         return {
             'success': True,
@@ -269,14 +357,14 @@ class EnhancedMaintenanceNLP:
             'sla': sla,
             'analysis': {
                 'matched_patterns': matched_patterns[:10],
-                'modifiers_applied': modifiers,
-                'system_found': system_found,
-                'system_multiplier': system_multiplier,
-                'scope_found': scope_found,
-                'scope_multiplier': scope_multiplier,
-                'urgency_bonus': urgency_bonus,
-                'urgency_terms': urgency_terms,
-                'base_score': round(pattern_score, 2),
+                'modifiers_applied': list(features['modifiers']),
+                'system_found': features['system_found'],
+                'system_multiplier': features['system_multiplier'],
+                'scope_found': features['scope_found'],
+                'scope_multiplier': features['scope_multiplier'],
+                'urgency_bonus': features['urgency_bonus'],
+                'urgency_terms': list(features['urgency_terms']),
+                'base_score': round(features['pattern_score'], 2),
                 'confidence': 'high' if len(matched_patterns) >= 2 else 'medium' if len(matched_patterns) == 1 else 'low'
             },
             'request_details': {
@@ -286,6 +374,28 @@ class EnhancedMaintenanceNLP:
                 'timestamp': request_data.get('timestamp', datetime.now().isoformat())
             }
         }
+    
+    def analyze(self, request_data: Dict) -> Dict:
+        """Main analysis method with advanced NLP"""
+        if not request_data or 'description' not in request_data:
+            return {
+                'success': False,
+                'error': 'Missing required field: description'
+            }
+        
+        features = self.extract_features(request_data)
+        
+        # Calculate final score
+        final_score = (features['modified_score'] * features['system_multiplier'] *
+                       features['scope_multiplier']) + features['urgency_bonus']
+        
+        # Determine priority level; a CRITICAL pattern match always forces CRITICAL
+        if features['base_severity'] == 'CRITICAL':
+            level = 0
+        else:
+            level = len(SCORE_LADDER) - bisect_right(SCORE_LADDER, final_score)
+        
+        return self.build_result(request_data, features, final_score, level)
 
 
 # Global instance
@@ -297,21 +407,89 @@ def analyze_maintenance_request(request_data: Dict) -> Dict:
     return nlp_model.analyze(request_data)
 
 
+# Score thresholds above the ROUTINE floor, highest first
+LEVEL_THRESHOLDS = np.array([threshold for threshold, *_ in PRIORITY_LEVELS[:-1]])
+
+
+def _score_levels_numpy(modified, system, scope, urgency, critical):
+    """Final scores and PRIORITY_LEVELS indexes for a batch of feature arrays"""
+    final_scores = (modified * system * scope) + urgency
+    levels = len(SCORE_LADDER) - np.searchsorted(SCORE_LADDER, final_scores, side='right')
+    levels[critical] = 0
+    return final_scores, levels
+
+
+try:
+    from numba import njit
+except ImportError:
+    score_levels = _score_levels_numpy
+else:
+    @njit(cache=True)
+    def score_levels(modified, system, scope, urgency, critical):
+        """Compiled single loop: score each request and walk the threshold ladder"""
+        n = modified.shape[0]
+        final_scores = np.empty(n)
+        levels = np.empty(n, dtype=np.int64)
+        for i in range(n):
+            score = (modified[i] * system[i] * scope[i]) + urgency[i]
+            final_scores[i] = score
+            level = LEVEL_THRESHOLDS.shape[0]
+            if critical[i]:
+                level = 0
+            else:
+                for j in range(LEVEL_THRESHOLDS.shape[0]):
+                    if score >= LEVEL_THRESHOLDS[j]:
+                        level = j
+                        break
+            levels[i] = level
+        return final_scores, levels
+    
+    # Compile at import so the first batch doesn't pay for the JIT
+    score_levels(np.ones(1), np.ones(1), np.ones(1), np.zeros(1), np.zeros(1, dtype=np.bool_))
+
+
+def analysis_cache_info() -> Dict:
+    """Hit/miss counts of the shared analysis cache, for health reporting"""
+    info = nlp_model.cached_text_features.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'max_size': info.maxsize}
+
+
 def process_batch_requests(requests: List[Dict]) -> Dict:
-    """Process multiple requests"""
-    results = []
-    priority_counts = {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0, 'ROUTINE': 0}
+    """Process multiple requests
+
+    Text analysis runs per request; scoring, priority assignment, counting
+    and ordering run once over the whole batch as NumPy arrays.
+    """
+    results = [None] * len(requests)
+    valid = []
     
     for idx, req in enumerate(requests):
         req['request_id'] = req.get('request_id', f'REQ-{idx+1}')
-        result = analyze_maintenance_request(req)
-        results.append(result)
-        
-        if result.get('success'):
-            priority_counts[result['priority']] += 1
+        if 'description' in req:
+            valid.append(idx)
+        else:
+            results[idx] = analyze_maintenance_request(req)
+    
+    # Struct-of-arrays view of the scoring inputs
+    features = [nlp_model.extract_features(requests[idx]) for idx in valid]
+    n = len(features)
+    modified = np.fromiter((f['modified_score'] for f in features), dtype=np.float64, count=n)
+    system = np.fromiter((f['system_multiplier'] for f in features), dtype=np.float64, count=n)
+    scope = np.fromiter((f['scope_multiplier'] for f in features), dtype=np.float64, count=n)
+    urgency = np.fromiter((f['urgency_bonus'] for f in features), dtype=np.float64, count=n)
+    critical = np.fromiter((f['base_severity'] == 'CRITICAL' for f in features), dtype=bool, count=n)
+    
+    final_scores, levels = score_levels(modified, system, scope, urgency, critical)
+    
+    for idx, f, final_score, level in zip(valid, features, final_scores.tolist(), levels.tolist()):
+        results[idx] = nlp_model.build_result(requests[idx], f, final_score, level)
+    
+    counts = np.bincount(levels.astype(np.intp), minlength=len(PRIORITY_LEVELS))
+    priority_counts = {priority: int(count) for (_, priority, _, _), count in zip(PRIORITY_LEVELS, counts)}
     
-    # Sort by priority score (highest first)
-    results.sort(key=lambda x: x.get('priority_score', 0), reverse=True)
+    # Sort by priority score (highest first), ties keep submission order
+    scores = np.fromiter((r.get('priority_score', 0) for r in results), dtype=np.float64, count=len(results))
+    results = [results[i] for i in np.argsort(-scores, kind='stable')]
     
     return {
         'success': True,
@@ -4,18 +4,33 @@ Real-time ticket updates with admin controls
 """
 
 from flask import Flask, request, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, send, rooms
-from enhanced_model import analyze_maintenance_request, process_batch_requests
+from enhanced_model import analyze_maintenance_request, process_batch_requests, analysis_cache_info
+import atexit
 import json
 import os
+import queue
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from itertools import count
 from datetime import datetime
 import uuid
+import secrets
 import jwt
-from functools import wraps
+from functools import lru_cache, wraps
 import requests
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,15 +42,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson so jsonify skips the stdlib encoder"""
+
+    option = orjson.OPT_NON_STR_KEYS if ORJSON_AVAILABLE else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option),
+            mimetype=self.mimetype
+        )
+
+
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = ORJSONProvider(app)
 app.config['SECRET_KEY'] = 'your-secret-key-change-in-production'
-CORS(app, resources={r"/*": {"origins": "*"}})
+CORS(app, resources={r"/*": {"origins": "*"}}, send_wildcard=True, max_age=86400)
 socketio = SocketIO(app, cors_allowed_origins="*")
 
 # Add correlation ID to all requests
 @app.before_request
 def before_request():
-    request.correlation_id = str(uuid.uuid4())
+    request.correlation_id = request.headers.get('X-Correlation-Id') or secrets.token_hex(8)
     logger.info(f"Request started: {request.method} {request.path}",
                 extra={'correlation_id': request.correlation_id})
 
@@ -52,6 +88,16 @@ ALGORITHM = 'HS256'
 # Service URLs
 NOTIFICATION_SERVICE = 'http://localhost:8004'
 
+# Handlers index user['userId'] and user['role'] directly, so tokens must carry them
+_jwt = jwt.PyJWT(options={'require': ['exp', 'userId', 'role'], 'verify_exp': True})
+_KEY = SECRET_KEY.encode('utf-8')
+_ALGORITHMS = [ALGORITHM]
+
+@lru_cache(maxsize=4096)
+def _decode(token):
+    """Decode a token, memoized on the raw token string"""
+    return _jwt.decode(token, _KEY, algorithms=_ALGORITHMS)
+
 # Helper function to verify JWT token
 def verify_token():
     """Verify JWT token and return user info"""
@@ -61,54 +107,96 @@ def verify_token():
     
     try:
         token = auth_header.split(' ')[1]
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except:
+        payload = _decode(token)
+    except (IndexError, jwt.InvalidTokenError):
         return None
+    # A memoized payload can outlive its exp, so expiry is checked per call
+    if payload['exp'] <= time.time():
+        return None
+    return dict(payload)
+
+# Outbound notifications are queued and posted by one background thread to
+# the notification service's batch endpoint, so handlers never wait on it.
+# Items are grouped by the caller's token, which authorizes each batch
+NOTIFICATION_BATCH_WINDOW = 0.05  # Seconds to gather a burst into one request
+NOTIFICATION_BATCH_MAX = 100
+notification_queue = queue.Queue()
+
+notification_http = requests.Session()
+notification_http.mount('http://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
 
 # Helper function to send notifications
 def send_notification(user_id: str, notification_type: str, message: str, token: str):
-    """Send notification to the notification service"""
-    try:
-        print(f"DEBUG send_notification: Sending to user_id={user_id}, type={notification_type}")
-        response = requests.post(
-            f'{NOTIFICATION_SERVICE}/notifications',
-            headers={'Authorization': f'Bearer {token}'},
-            json={
-                'user_id': user_id,
-                'type': notification_type,
-                'message': message
-            },
-            timeout=2
-        )
-        print(f"DEBUG send_notification: Response status={response.status_code}")
-    except Exception as e:
-        # Don't fail the main operation if notification fails
-        print(f"ERROR: Failed to send notification: {e}")
+    """Queue a notification for one user"""
+    logger.debug(f"Queueing notification for user_id={user_id}, type={notification_type}",
+                 extra={'correlation_id': 'notification'})
+    notification_queue.put((token, {
+        'user_id': user_id,
+        'type': notification_type,
+        'message': message
+    }))
 
 def notify_admins(action_type: str, message: str, actor_name: str, actor_id: str, token: str):
-    """Send notification to all admin users - non-blocking"""
-    try:
-        # Use very short timeout and don't wait for response
-        requests.post(
-            f'{NOTIFICATION_SERVICE}/notifications/admin',
-            headers={'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'},
-            json={
-                'type': action_type,
-                'message': message,
-                'actor_name': actor_name,
-                'actor_id': actor_id
-            },
-            timeout=0.5
-        )
-    except Exception:
-        # Silently fail - notifications are not critical
-        pass
+    """Queue a notification for all admin users"""
+    notification_queue.put((token, {
+        'audience': 'admins',
+        'type': action_type,
+        'message': message,
+        'actor_name': actor_name,
+        'actor_id': actor_id
+    }))
+
+def notification_sender():
+    """Post queued notifications in batches, one request per token"""
+    while True:
+        batch = [notification_queue.get()]
+        time.sleep(NOTIFICATION_BATCH_WINDOW)
+        while len(batch) < NOTIFICATION_BATCH_MAX and not notification_queue.empty():
+            batch.append(notification_queue.get_nowait())
+        
+        items_by_token = {}
+        for token, item in batch:
+            items_by_token.setdefault(token, []).append(item)
+        for token, items in items_by_token.items():
+            try:
+                response = notification_http.post(
+                    f'{NOTIFICATION_SERVICE}/notifications/batch',
+                    headers={'Authorization': f'Bearer {token}'},
+                    json={'items': items},
+                    timeout=2
+                )
+                logger.debug(f"Sent {len(items)} notification(s), status={response.status_code}",
+                             extra={'correlation_id': 'notification'})
+            except Exception as e:
+                # Don't fail anything else if notifications fail
+                logger.warning(f"Failed to send notifications: {e}", extra={'correlation_id': 'notification'})
+
+threading.Thread(target=notification_sender, name='notification-sender', daemon=True).start()
+
+# Broadcasts within BROADCAST_WINDOW go out together as one bulk_update
+# event, in the order they happened, so a burst of changes costs one emit
+BROADCAST_WINDOW = 0.05
+pending_broadcasts = []
+broadcast_lock = threading.Lock()
 
 # Helper function to broadcast to all connected clients
 def broadcast_event(event, data):
-    """Broadcast an event to all connected clients"""
-    socketio.emit(event, data, namespace='/')
+    """Queue an event for all connected clients"""
+    # Copy now: tickets are updated in place, and each event must carry the
+    # state it was raised with, not the state at flush time
+    with broadcast_lock:
+        pending_broadcasts.append({'event': event, 'data': dict(data)})
+        first = len(pending_broadcasts) == 1
+    if first:
+        socketio.start_background_task(flush_broadcasts)
+
+def flush_broadcasts():
+    """Send everything queued during the window as one bulk_update"""
+    socketio.sleep(BROADCAST_WINDOW)
+    with broadcast_lock:
+        events = pending_broadcasts[:]
+        pending_broadcasts.clear()
+    socketio.emit('bulk_update', {'events': events}, namespace='/')
 
 
 # In-memory storage (can be replaced with database)
@@ -119,28 +207,243 @@ TICKETS_FILE = 'tickets_storage.json'
 ADMIN_PASSWORD = "admin123"
 
 
+# Ticket storage is read and written with orjson when it's installed
+if ORJSON_AVAILABLE:
+    json_loads = orjson.loads
+
+    def json_bytes(obj, indent=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+else:
+    json_loads = json.loads
+
+    def json_bytes(obj, indent=False):
+        return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+
+# Mutations are appended to TICKETS_LOG, one JSON line each, instead of
+# rewriting every ticket; the log is folded into TICKETS_FILE at startup
+# and every TICKETS_COMPACT_EVERY appends
+TICKETS_LOG = 'tickets_storage.log'
+TICKETS_COMPACT_EVERY = 1000
+TICKETS_FLUSH_WINDOW = 0.1  # Seconds the writer waits to gather a burst into one flush
+ticket_log = None
+ticket_log_entries = 0
+
+# Handlers serialize the change and queue it; a single writer thread does
+# the file I/O in queue order so responses don't wait on the disk
+ticket_writes = queue.Queue()
+
+
 def load_tickets():
-    """Load tickets from persistent storage"""
-    global tickets
+    """Load tickets from persistent storage: the snapshot, then the log on top"""
+    global tickets, resolved_count
     if os.path.exists(TICKETS_FILE):
         try:
-            with open(TICKETS_FILE, 'r') as f:
-                tickets = json.load(f)
-            print(f"Loaded {len(tickets)} tickets from storage")
+            with open(TICKETS_FILE, 'rb') as f:
+                tickets = json_loads(f.read())
         except Exception as e:
             print(f"Error loading tickets: {e}")
             tickets = {}
     else:
         tickets = {}
+    
+    if os.path.exists(TICKETS_LOG):
+        with open(TICKETS_LOG, 'rb') as f:
+            for line in f:
+                try:
+                    entry = json_loads(line)
+                except ValueError:
+                    continue  # Torn last line from a crash mid-write
+                if entry['op'] == 'put':
+                    tickets[entry['id']] = entry['ticket']
+                else:
+                    tickets.pop(entry['id'], None)
+    if tickets:
+        print(f"Loaded {len(tickets)} tickets from storage")
+    compact_tickets()
+    
+    tickets_by_requester.clear()
+    counted_tickets.clear()
+    priority_counts.clear()
+    resolved_count = 0
+    # Sort the listing once rather than inserting tickets one at a time
+    listing_keys.clear()
+    for ticket_id, ticket in tickets.items():
+        listing_keys[ticket_id] = listing_key(ticket_id, ticket, next(listing_seq))
+    tickets_by_priority[:] = sorted(listing_keys.values())
+    for ticket_id in tickets:
+        index_ticket(ticket_id)
+
+
+def compact_tickets():
+    """Queue a full snapshot; the writer swaps it in and starts a fresh log"""
+    global ticket_log_entries
+    try:
+        snapshot = json_bytes(tickets, indent=True)
+    except Exception as e:
+        print(f"Error saving tickets: {e}")
+        return
+    ticket_writes.put(('snapshot', snapshot))
+    ticket_log_entries = 0
 
 
-def save_tickets():
-    """Save tickets to persistent storage"""
+def append_ticket_log(entry):
+    """Queue one mutation for the log, compacting once it grows long"""
+    global ticket_log_entries
     try:
-        with open(TICKETS_FILE, 'w') as f:
-            json.dump(tickets, f, indent=2)
+        line = json_bytes(entry) + b'\n'
     except Exception as e:
         print(f"Error saving tickets: {e}")
+        return
+    ticket_writes.put(('log', line))
+    ticket_log_entries += 1
+    if ticket_log_entries >= TICKETS_COMPACT_EVERY:
+        compact_tickets()
+
+
+def write_snapshot(snapshot):
+    """Replace TICKETS_FILE with snapshot and truncate the log it covers"""
+    global ticket_log
+    # Replace the snapshot atomically so a crash never leaves it half written
+    with open(TICKETS_FILE + '.tmp', 'wb') as f:
+        f.write(snapshot)
+    os.replace(TICKETS_FILE + '.tmp', TICKETS_FILE)
+    if ticket_log is not None:
+        ticket_log.close()
+    ticket_log = open(TICKETS_LOG, 'wb')
+
+
+def ticket_writer():
+    """Drain queued writes in order, flushing the log once per batch"""
+    while True:
+        batch = [ticket_writes.get()]
+        if batch[0] is not None:
+            time.sleep(TICKETS_FLUSH_WINDOW)
+        while not ticket_writes.empty():
+            batch.append(ticket_writes.get_nowait())
+        for item in batch:
+            if item is None:
+                if ticket_log is not None:
+                    ticket_log.flush()
+                return
+            kind, data = item
+            try:
+                if kind == 'snapshot':
+                    write_snapshot(data)
+                else:
+                    ticket_log.write(data)
+            except Exception as e:
+                print(f"Error saving tickets: {e}")
+        try:
+            if ticket_log is not None:
+                ticket_log.flush()
+        except Exception as e:
+            print(f"Error saving tickets: {e}")
+
+
+def stop_ticket_writer():
+    """Fold the log into the snapshot and let the writer finish before exit"""
+    if ticket_log_entries:
+        compact_tickets()
+    ticket_writes.put(None)
+    ticket_writer_thread.join(timeout=5)
+
+
+ticket_writer_thread = threading.Thread(target=ticket_writer, name='ticket-writer', daemon=True)
+ticket_writer_thread.start()
+atexit.register(stop_ticket_writer)
+
+
+def save_ticket(ticket_id):
+    """Persist and index the current state of one created or modified ticket"""
+    index_ticket(ticket_id)
+    append_ticket_log({'op': 'put', 'id': ticket_id, 'ticket': tickets[ticket_id]})
+
+
+def save_ticket_deleted(ticket_id, ticket):
+    """Persist the removal of one ticket and drop it from the indexes"""
+    unindex_ticket(ticket_id, ticket)
+    append_ticket_log({'op': 'del', 'id': ticket_id})
+
+
+# Ticket IDs per requester email, in creation order, so a student's
+# listing doesn't scan every ticket
+tickets_by_requester = {}
+
+# Listing order for GET /tickets, kept sorted as tickets change: highest
+# priority_score first, ties in creation order. Entries are
+# (-priority_score, sequence, ticket_id); listing_keys maps each ticket to
+# its entry
+tickets_by_priority = []
+listing_keys = {}
+listing_seq = count()
+
+# Running totals for get_stats, and what each ticket last contributed to
+# them, since tickets are modified in place before they're saved
+priority_counts = Counter()
+resolved_count = 0
+counted_tickets = {}
+
+
+def requester_of(ticket):
+    return ticket.get('request_details', {}).get('requester', '')
+
+
+def listing_key(ticket_id, ticket, seq):
+    return (-ticket.get('priority_score', 0), seq, ticket_id)
+
+
+def index_ticket(ticket_id):
+    """Add a new or modified ticket to the requester index, listing and stats"""
+    global resolved_count
+    ticket = tickets[ticket_id]
+    tickets_by_requester.setdefault(requester_of(ticket), {})[ticket_id] = None
+    
+    key = listing_keys.get(ticket_id)
+    if key is None or key[0] != -ticket.get('priority_score', 0):
+        seq = next(listing_seq) if key is None else key[1]
+        unlist_ticket(ticket_id)
+        listing_keys[ticket_id] = key = listing_key(ticket_id, ticket, seq)
+        insort(tickets_by_priority, key)
+    
+    uncount_ticket(ticket_id)
+    priority = ticket.get('priority', 'ROUTINE')
+    if not isinstance(priority, str):
+        priority = str(priority)  # Admins can set anything; keep it countable
+    resolved = ticket.get('status') == 'resolved'
+    priority_counts[priority] += 1
+    resolved_count += resolved
+    counted_tickets[ticket_id] = (priority, resolved)
+
+
+def unindex_ticket(ticket_id, ticket):
+    """Drop a deleted ticket from the requester index and stats"""
+    ids = tickets_by_requester.get(requester_of(ticket))
+    if ids is not None:
+        ids.pop(ticket_id, None)
+    unlist_ticket(ticket_id)
+    uncount_ticket(ticket_id)
+
+
+def unlist_ticket(ticket_id):
+    key = listing_keys.pop(ticket_id, None)
+    if key is not None:
+        del tickets_by_priority[bisect_left(tickets_by_priority, key)]
+
+
+def uncount_ticket(ticket_id):
+    global resolved_count
+    counted = counted_tickets.pop(ticket_id, None)
+    if counted is not None:
+        priority, resolved = counted
+        priority_counts[priority] -= 1
+        if not priority_counts[priority]:
+            del priority_counts[priority]
+        resolved_count -= resolved
+
+
+# Load at import time so WSGI servers (gunicorn) start with existing tickets
+load_tickets()
 
 
 @app.route('/', methods=['GET'])
@@ -155,7 +458,8 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'tickets_count': len(tickets),
-        'websocket_enabled': True
+        'websocket_enabled': True,
+        'analysis_cache': analysis_cache_info()
     })
 
 
@@ -167,30 +471,25 @@ def get_all_tickets():
     if not user:
         return jsonify({'error': 'Unauthorized'}), 401
     
+    # Optional paging over the priority-ordered listing
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = request.args.get('limit', type=int)
+    end = None if limit is None else offset + max(limit, 0)
+    
     # Filter tickets based on role
     if user['role'] in ['faculty', 'admin']:
-        # Faculty and admin see all tickets
-        ticket_list = sorted(
-            tickets.values(),
-            key=lambda x: x.get('priority_score', 0),
-            reverse=True
-        )
+        # Faculty and admin see all tickets, already in listing order
+        keys = tickets_by_priority
     else:
         # Students see only their own tickets
         user_email = user.get('email', '')
-        ticket_list = [
-            ticket for ticket in tickets.values()
-            if ticket.get('request_details', {}).get('requester', '') == user_email
-        ]
-        ticket_list = sorted(
-            ticket_list,
-            key=lambda x: x.get('priority_score', 0),
-            reverse=True
-        )
+        keys = sorted(listing_keys[ticket_id] for ticket_id in tickets_by_requester.get(user_email, ()))
+    ticket_list = [tickets[ticket_id] for _, _, ticket_id in keys[offset:end]]
     
     return jsonify({
         'success': True,
         'count': len(ticket_list),
+        'total': len(keys),
         'tickets': ticket_list
     })
 
@@ -247,7 +546,7 @@ def update_ticket(ticket_id):
         old_status = tickets[ticket_id]['status']
         tickets[ticket_id]['status'] = data['status']
         tickets[ticket_id]['updated_at'] = datetime.utcnow().isoformat()
-        save_tickets()
+        save_ticket(ticket_id)
         
         # Broadcast update to all connected clients
         broadcast_event('ticket_updated', tickets[ticket_id])
@@ -322,7 +621,7 @@ def delete_ticket(ticket_id):
     
     try:
         deleted_ticket = tickets.pop(ticket_id)
-        save_tickets()
+        save_ticket_deleted(ticket_id, deleted_ticket)
         
         # Broadcast deletion to all connected clients
         broadcast_event('ticket_deleted', {'ticket_id': ticket_id})
@@ -411,7 +710,7 @@ def analyze():
             
             # Store ticket
             tickets[ticket_id] = result
-            save_tickets()
+            save_ticket(ticket_id)
             
             # Broadcast to all connected clients
             broadcast_event('new_ticket', result)
@@ -443,14 +742,54 @@ def analyze():
         }), 500
 
 
+# How many tickets a dashboard receives up front, and per get_tickets page
+INITIAL_TICKETS_LIMIT = 200
+
+
+def listing_cursor(page):
+    """Position just past the last entry of a page, as (-priority_score, sequence)"""
+    return list(page[-1][:2]) if page else None
+
+
 @socketio.on('connect')
 def handle_connect():
     """Handle new WebSocket connection"""
     print(f'Client connected: {request.sid}')
-    # Send current tickets to newly connected client
+    # Send the highest-priority tickets to newly connected client; it pages
+    # through the rest with get_tickets from the returned cursor
+    page = tickets_by_priority[:INITIAL_TICKETS_LIMIT]
     emit('initial_tickets', {
-        'tickets': list(tickets.values()),
-        'count': len(tickets)
+        'tickets': [tickets[ticket_id] for _, _, ticket_id in page],
+        'count': len(tickets),
+        'truncated': len(tickets) > INITIAL_TICKETS_LIMIT,
+        'cursor': listing_cursor(page)
+    })
+
+
+@socketio.on('get_tickets')
+def handle_get_tickets(data=None):
+    """Send one page of tickets in priority order to a dashboard loading more"""
+    data = data if isinstance(data, dict) else {}
+    try:
+        limit = min(max(int(data.get('limit', INITIAL_TICKETS_LIMIT)), 0), INITIAL_TICKETS_LIMIT)
+        after = data.get('after')
+        if after is None:
+            start = 0
+        else:
+            # Resume after the previous page's last entry rather than at an
+            # offset, which tickets added or removed above it would shift
+            neg_score, seq = after
+            start = bisect_right(tickets_by_priority, (float(neg_score), int(seq)), key=lambda entry: entry[:2])
+    except (TypeError, ValueError):
+        emit('error', {'message': 'after must be a [score, sequence] cursor and limit an integer'})
+        return
+    
+    page = tickets_by_priority[start:start + limit]
+    emit('tickets_page', {
+        'tickets': [tickets[ticket_id] for _, _, ticket_id in page],
+        'cursor': listing_cursor(page) or after,
+        'count': len(tickets),
+        'has_more': start + len(page) < len(tickets_by_priority)
     })
 
 
@@ -478,7 +817,7 @@ def handle_submit_ticket(data):
         if result.get('success'):
             # Store ticket
             tickets[ticket_id] = result
-            save_tickets()
+            save_ticket(ticket_id)
             
             # Broadcast to all clients
             broadcast_event('new_ticket', result)
@@ -519,7 +858,7 @@ def handle_admin_command(data):
             ticket_id = data.get('ticket_id')
             if ticket_id in tickets:
                 deleted_ticket = tickets.pop(ticket_id)
-                save_tickets()
+                save_ticket_deleted(ticket_id, deleted_ticket)
                 
                 # Broadcast deletion to all clients
                 broadcast_event('ticket_deleted', {
@@ -558,7 +897,7 @@ def handle_admin_command(data):
                 elif new_status == 'completed':
                     tickets[ticket_id]['completed_at'] = datetime.now().isoformat()
                 
-                save_tickets()
+                save_ticket(ticket_id)
                 
                 # Broadcast update to all clients
                 broadcast_event('ticket_updated', tickets[ticket_id])
@@ -578,7 +917,7 @@ def handle_admin_command(data):
                 tickets[ticket_id]['priority'] = new_priority
                 tickets[ticket_id]['admin_modified'] = True
                 tickets[ticket_id]['modified_at'] = datetime.now().isoformat()
-                save_tickets()
+                save_ticket(ticket_id)
                 
                 # Broadcast update to all clients
                 broadcast_event('ticket_updated', tickets[ticket_id])
@@ -607,22 +946,18 @@ def handle_get_stats():
         'MEDIUM': 0,
         'LOW': 0,
         'ROUTINE': 0,
-        'resolved': 0
+        'resolved': resolved_count
     }
     
-    for ticket in tickets.values():
-        priority = ticket.get('priority', 'ROUTINE')
-        stats[priority] = stats.get(priority, 0) + 1
-        if ticket.get('status') == 'resolved':
-            stats['resolved'] += 1
+    # Counts are kept up to date as tickets are saved
+    for priority, count in priority_counts.items():
+        stats[priority] = stats.get(priority, 0) + count
     
     emit('stats_update', stats)
 
 
 if __name__ == '__main__':
-    # Load existing tickets on startup
-    load_tickets()
-    
+    # Development server; production runs under gunicorn (see Dockerfile)
     print(f"Starting WebSocket-enabled Maintenance Ticketing System")
     print(f"Loaded {len(tickets)} existing tickets")
     print(f"Admin password: {ADMIN_PASSWORD}")
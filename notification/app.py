@@ -8,11 +8,14 @@ from flask import Flask, jsonify, request
 from flask_cors import CORS
 import jwt
 import sqlite3
-from functools import wraps
+import threading
+from functools import lru_cache, wraps
 from datetime import datetime
 import uuid
+import secrets
 import requests
 import logging
+import time
 
 # Configure logging
 logging.basicConfig(
@@ -26,12 +29,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, send_wildcard=True, max_age=86400)
 
 # Add correlation ID to all requests
 @app.before_request
 def before_request():
-    request.correlation_id = str(uuid.uuid4())
+    request.correlation_id = request.headers.get('X-Correlation-Id') or secrets.token_hex(8)
     logger.info(f"Request started: {request.method} {request.path}",
                 extra={'correlation_id': request.correlation_id})
 
@@ -46,28 +49,78 @@ SECRET_KEY = 'your-secret-key-change-in-production'
 ALGORITHM = 'HS256'
 
 # Database setup
-def get_db():
-    conn = sqlite3.connect('notifications.db')
+DB_PATH = 'notifications.db'
+
+# Applied once when each connection is opened
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+)
+
+def connect_db():
+    """Open a tuned connection"""
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+# Each worker thread keeps one connection open instead of reconnecting per request
+db_local = threading.local()
+
+def get_db():
+    """Return this thread's connection, opening it on first use"""
+    conn = getattr(db_local, 'conn', None)
+    if conn is None:
+        conn = db_local.conn = connect_db()
+    elif conn.in_transaction:
+        conn.rollback()  # Left open by a request that failed mid-write
     return conn
 
 def init_db():
-    conn = get_db()
-    conn.execute("""
+    # A throwaway connection, so none is inherited by forked workers
+    conn = connect_db()
+    # created_at is stamped by SQLite so inserts don't format it in Python
+    schema = """
         CREATE TABLE IF NOT EXISTS notifications (
             id TEXT PRIMARY KEY,
             user_id TEXT NOT NULL,
             type TEXT NOT NULL,
             message TEXT NOT NULL,
             read BOOLEAN DEFAULT 0,
-            created_at TEXT NOT NULL
+            created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
         )
-    """)
-    conn.commit()
+    """
+    with conn:
+        # Older databases lack the created_at default; rebuild the table to add it
+        existing = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'notifications'"
+        ).fetchone()
+        if existing and "strftime" not in existing["sql"]:
+            conn.execute("ALTER TABLE notifications RENAME TO notifications_old")
+            conn.execute(schema)
+            conn.execute("INSERT INTO notifications SELECT * FROM notifications_old")
+            conn.execute("DROP TABLE notifications_old")
+        else:
+            conn.execute(schema)
+        # Per-user listing and unread count
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_notifications_user_created ON notifications(user_id, created_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_notifications_user_read ON notifications(user_id, read)")
     conn.close()
 
 init_db()
 
+# Routes read request.user['userId'] and ['role'], so require both claims
+_jwt = jwt.PyJWT(options={'require': ['exp', 'userId', 'role'], 'verify_exp': True})
+_KEY = SECRET_KEY.encode('utf-8')
+_ALGORITHMS = [ALGORITHM]
+
+@lru_cache(maxsize=4096)
+def _decode(token):
+    """Decode a token once and reuse the payload for later requests"""
+    return _jwt.decode(token, _KEY, algorithms=_ALGORITHMS)
+
 # JWT Middleware
 def token_required(f):
     @wraps(f)
@@ -84,13 +137,17 @@ def token_required(f):
             return jsonify({'error': 'Token is missing'}), 401
         
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            request.user = payload
+            payload = _decode(token)
         except jwt.ExpiredSignatureError:
             return jsonify({'error': 'Token expired'}), 401
         except jwt.InvalidTokenError:
             return jsonify({'error': 'Invalid token'}), 401
         
+        # The cache doesn't know about exp, so check it again here
+        if payload['exp'] <= time.time():
+            return jsonify({'error': 'Token expired'}), 401
+        
+        request.user = dict(payload)
         return f(*args, **kwargs)
     return decorated
 
@@ -121,12 +178,11 @@ def create_notification():
         notif_id = str(uuid.uuid4())
         
         conn.execute("""
-            INSERT INTO notifications (id, user_id, type, message, created_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, (notif_id, data['user_id'], data['type'], data['message'], datetime.utcnow().isoformat()))
+            INSERT INTO notifications (id, user_id, type, message)
+            VALUES (?, ?, ?, ?)
+        """, (notif_id, data['user_id'], data['type'], data['message']))
         
         conn.commit()
-        conn.close()
         
         return jsonify({'message': 'Notification created', 'notificationId': notif_id}), 201
         
@@ -151,7 +207,6 @@ def get_notifications():
             ORDER BY created_at DESC LIMIT 50
         """, (request.user['userId'],)).fetchall()
     
-    conn.close()
     return jsonify({'notifications': [dict(n) for n in notifications]}), 200
 
 @app.route('/notifications/<notif_id>/read', methods=['PUT'])
@@ -164,16 +219,13 @@ def mark_as_read(notif_id):
     notif = conn.execute("SELECT * FROM notifications WHERE id = ?", (notif_id,)).fetchone()
     
     if not notif:
-        conn.close()
         return jsonify({'error': 'Notification not found'}), 404
     
     if notif['user_id'] != request.user['userId'] and request.user['role'] != 'admin':
-        conn.close()
         return jsonify({'error': 'Unauthorized'}), 403
     
     conn.execute("UPDATE notifications SET read = 1 WHERE id = ?", (notif_id,))
     conn.commit()
-    conn.close()
     
     return jsonify({'message': 'Notification marked as read'}), 200
 
@@ -186,10 +238,44 @@ def get_unread_count():
         SELECT COUNT(*) as count FROM notifications 
         WHERE user_id = ? AND read = 0
     """, (request.user['userId'],)).fetchone()
-    conn.close()
     
     return jsonify({'unreadCount': result['count']}), 200
 
+# Admin fan-out helpers
+USER_MGMT_URL = 'http://localhost:8002'
+
+# Admin lookups reuse kept-alive connections to user-management
+user_mgmt_http = requests.Session()
+user_mgmt_http.mount('http://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=8))
+ADMIN_FIELDS = ['type', 'message', 'actor_name', 'actor_id']
+USER_FIELDS = ['user_id', 'type', 'message']
+
+def get_admin_ids(auth_header):
+    """Fetch admin user IDs from user-management, falling back to the default admin"""
+    try:
+        # Get all users to filter admins - use short timeout
+        headers = {'Authorization': auth_header} if auth_header else {}
+        response = user_mgmt_http.get(f"{USER_MGMT_URL}/users", headers=headers, timeout=1)
+
+        if response.status_code == 200:
+            users = response.json().get('users', [])
+            return [user['id'] for user in users if user.get('role') == 'admin']
+    except:
+        pass
+    # Fallback to known admin IDs if service is unavailable
+    return ['admin-001']
+
+def admin_rows(data, admin_ids, timestamp):
+    """Build one notification row per admin, skipping the actor"""
+    # Format message with timestamp and actor info
+    formatted_message = f"[{timestamp}] {data['actor_name']} (ID: {data['actor_id'][:8]}...): {data['message']}"
+    return [
+        (str(uuid.uuid4()), admin_id, data['type'], formatted_message)
+        for admin_id in admin_ids
+        # Don't notify the actor if they're an admin
+        if admin_id != data['actor_id']
+    ]
+
 @app.route('/notifications/admin', methods=['POST'])
 @token_required
 def notify_admins():
@@ -197,59 +283,77 @@ def notify_admins():
     try:
         data = request.get_json()
         
-        if not data or not all(k in data for k in ['type', 'message', 'actor_name', 'actor_id']):
+        if not data or not all(k in data for k in ADMIN_FIELDS):
             return jsonify({'error': 'Missing required fields: type, message, actor_name, actor_id'}), 400
         
-        # Get user-management service to fetch admin users
-        USER_MGMT_URL = 'http://localhost:8002'
-        try:
-            # Get all users to filter admins - use short timeout
-            auth_header = request.headers.get('Authorization')
-            headers = {'Authorization': auth_header} if auth_header else {}
-            response = requests.get(f"{USER_MGMT_URL}/users", headers=headers, timeout=1)
-            
-            if response.status_code == 200:
-                users = response.json().get('users', [])
-                admin_ids = [user['id'] for user in users if user.get('role') == 'admin']
-            else:
-                # Fallback to known admin IDs
-                admin_ids = ['admin-001']
-        except:
-            # Fallback to known admin IDs if service is unavailable
-            admin_ids = ['admin-001']
+        admin_ids = get_admin_ids(request.headers.get('Authorization'))
         
         conn = get_db()
         timestamp = datetime.utcnow().isoformat()
-        notification_ids = []
-        
-        # Format message with timestamp and actor info
-        formatted_message = f"[{timestamp}] {data['actor_name']} (ID: {data['actor_id'][:8]}...): {data['message']}"
-        
-        # Create notification for each admin
-        for admin_id in admin_ids:
-            # Don't notify the actor if they're an admin
-            if admin_id == data['actor_id']:
-                continue
-                
-            notif_id = str(uuid.uuid4())
-            conn.execute("""
-                INSERT INTO notifications (id, user_id, type, message, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (notif_id, admin_id, data['type'], formatted_message, timestamp))
-            notification_ids.append(notif_id)
+        rows = admin_rows(data, admin_ids, timestamp)
+        
+        conn.executemany("""
+            INSERT INTO notifications (id, user_id, type, message)
+            VALUES (?, ?, ?, ?)
+        """, rows)
         
         conn.commit()
-        conn.close()
         
         return jsonify({
-            'message': f'Notified {len(notification_ids)} admin(s)',
-            'notificationIds': notification_ids
+            'message': f'Notified {len(rows)} admin(s)',
+            'notificationIds': [row[0] for row in rows]
         }), 201
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/notifications/batch', methods=['POST'])
+@token_required
+def create_notifications_batch():
+    """Create several notifications in one transaction
+
+    Each item is either a user notification (user_id, type, message) or an
+    admin fan-out ("audience": "admins", type, message, actor_name, actor_id).
+    Either every item is stored or none is.
+    """
+    data = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else None
+
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'Missing required field: items'}), 400
+
+    for i, item in enumerate(items):
+        fields = ADMIN_FIELDS if isinstance(item, dict) and item.get('audience') == 'admins' else USER_FIELDS
+        if not isinstance(item, dict) or not all(k in item for k in fields):
+            return jsonify({'error': f"Item {i} is missing required fields: {', '.join(fields)}"}), 400
+
+    admin_ids = None
+    rows = []
+    for item in items:
+        if item.get('audience') == 'admins':
+            if admin_ids is None:
+                admin_ids = get_admin_ids(request.headers.get('Authorization'))
+                timestamp = datetime.utcnow().isoformat()
+            rows.extend(admin_rows(item, admin_ids, timestamp))
+        else:
+            rows.append((str(uuid.uuid4()), item['user_id'], item['type'], item['message']))
+
+    conn = get_db()
+    try:
+        with conn:
+            conn.executemany("""
+                INSERT INTO notifications (id, user_id, type, message)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    return jsonify({
+        'message': f'Created {len(rows)} notification(s)',
+        'notificationIds': [row[0] for row in rows]
+    }), 201
+
 if __name__ == '__main__':
     print("🔔 Notification Service starting on port 8004...")
     print("✅ Event logging and notification history")
-    app.run(host='0.0.0.0', port=8004, debug=True)
+    app.run(host='0.0.0.0', port=8004, debug=False)
@@ -1 +0,0 @@
-# Notification Service
\ No newline at end of file
@@ -11,6 +11,7 @@ import sqlite3
 from functools import wraps
 from datetime import datetime
 import uuid
+import secrets
 import requests
 import logging
 
@@ -26,12 +27,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, send_wildcard=True, max_age=86400)
 
 # Add correlation ID to all requests
 @app.before_request
 def before_request():
-    request.correlation_id = str(uuid.uuid4())
+    request.correlation_id = request.headers.get('X-Correlation-Id') or secrets.token_hex(8)
     logger.info(f"Request started: {request.method} {request.path}",
                 extra={'correlation_id': request.correlation_id})
 
@@ -45,6 +46,10 @@ def after_request(response):
 GATEWAY_URL = 'http://localhost:5001'
 NOTIFICATION_SERVICE = 'http://localhost:8004'
 
+# Calls to the gateway and notification service reuse kept-alive connections
+http = requests.Session()
+http.mount('http://', requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=8))
+
 # JWT Configuration
 SECRET_KEY = 'your-secret-key-change-in-production'
 ALGORITHM = 'HS256'
@@ -130,7 +135,7 @@ def notify_admins(action_type, message, actor_name, actor_id, token):
             'actor_id': actor_id
         }
         # Very short timeout, don't block the main operation
-        requests.post(f"{NOTIFICATION_SERVICE}/notifications/admin", 
+        http.post(f"{NOTIFICATION_SERVICE}/notifications/admin", 
                      json=payload, headers=headers, timeout=0.5)
     except Exception:
         # Silently fail - notifications are not critical
@@ -213,7 +218,7 @@ def create_user():
         
         # Also create login credentials in gateway by calling its register endpoint
         try:
-            register_response = requests.post(
+            register_response = http.post(
                 f'{GATEWAY_URL}/auth/register',
                 json={
                     'email': data['email'],
@@ -316,7 +321,7 @@ def update_user(user_id):
                 auth_header = request.headers.get('Authorization')
                 
                 # Get gateway users to find matching user by email
-                gateway_users_response = requests.get(
+                gateway_users_response = http.get(
                     f'{GATEWAY_URL}/users',
                     headers={'Authorization': auth_header},
                     timeout=5
@@ -328,7 +333,7 @@ def update_user(user_id):
                     
                     if gateway_user:
                         # Update role in gateway
-                        update_response = requests.put(
+                        update_response = http.put(
                             f'{GATEWAY_URL}/users/{gateway_user["id"]}',
                             headers={'Authorization': auth_header, 'Content-Type': 'application/json'},
                             json={'role': data['role']},
@@ -405,7 +410,7 @@ def delete_user(user_id):
         auth_header = request.headers.get('Authorization')
         
         # First, get all users from gateway to find the matching one
-        gateway_users_response = requests.get(
+        gateway_users_response = http.get(
             f'{GATEWAY_URL}/users',
             headers={'Authorization': auth_header},
             timeout=5
@@ -418,7 +423,7 @@ def delete_user(user_id):
             
             if gateway_user:
                 # Delete from gateway
-                delete_response = requests.delete(
+                delete_response = http.delete(
                     f'{GATEWAY_URL}/users/{gateway_user["id"]}',
                     headers={'Authorization': auth_header},
                     timeout=5
@@ -465,4 +470,4 @@ def get_users_by_role(role):
 if __name__ == '__main__':
     logger.info("👥 User Management Service starting on port 8002...", extra={'correlation_id': 'startup'})
     logger.info("✅ Default users created (admin, faculty, student)", extra={'correlation_id': 'startup'})
-    app.run(host='0.0.0.0', port=8002, debug=True)
+    app.run(host='0.0.0.0', port=8002, debug=False)